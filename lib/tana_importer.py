@@ -5,82 +5,316 @@ This module contains the core functionality for importing Tana JSON exports
 and converting them to organized markdown files with directory structure.
 """
 
+import io
 import json
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 
 from .tana_io import TanaIO
 from .colors import Colors
+from . import json_backend
 
 
-def add_markdown_footer(content: List[str], source_file: Path = None) -> List[str]:
-    """Add footer with import filename and date/time to markdown content"""
+def _write_markdown(file_path: Union[Path, str], content: str) -> None:
+    """Write markdown as pre-encoded UTF-8 bytes in a single write call"""
+    # Binary mode skips the TextIOWrapper/incremental encoder stack that
+    # text mode sets up for every one of the (often thousands of) files
+    with open(file_path, 'wb') as f:
+        f.write(content.encode('utf-8'))
+
+
+def markdown_footer(source_file: Path = None) -> str:
+    """Build the footer with import filename and date/time, or '' without a source file"""
     if source_file and source_file.exists():
         # Get file modification time
         mod_time = datetime.fromtimestamp(source_file.stat().st_mtime)
-        footer = f"\n\n---\n*Imported from {source_file.name} -- {mod_time.strftime('%Y-%m-%d %H:%M:%S')}*"
+        return f"\n\n---\n*Imported from {source_file.name} -- {mod_time.strftime('%Y-%m-%d %H:%M:%S')}*"
+    return ''
+
+
+def add_markdown_footer(content: List[str], source_file: Path = None) -> List[str]:
+    """Add footer with import filename and date/time to markdown content"""
+    footer = markdown_footer(source_file)
+    if footer:
         content.append(footer)
     return content
 
 
+# Node names that mark a home/root node, checked in one case-insensitive scan
+_HOME_NAME_RE = re.compile(r'home|root|main|start', re.IGNORECASE)
+
+# File writes are I/O bound and release the GIL, so use more threads than cores
+_WRITE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Sentinel returned by next() once a child iterator on the traversal stack is exhausted
+_EXHAUSTED = object()
+
+# Marks a traversal path that has not been joined into a string yet
+_UNJOINED = object()
+
+
+def _indents(level: int) -> Tuple[str, str, str]:
+    """Indent strings used by format_children at level, level + 1 and level + 2"""
+    return '  ' * level, '  ' * (level + 1), '  ' * (level + 2)
+
+
+class NodeInfo:
+    """A node matched to a target supertag during extraction"""
+
+    __slots__ = ('name', 'node_id', 'description', 'created', 'children', 'path')
+
+    def __init__(self, name: str, node_id: str, description: str, created: Any,
+                 children: List[Any], path: Optional[str]):
+        self.name = name
+        self.node_id = node_id
+        self.description = description
+        self.created = created
+        self.children = children
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"NodeInfo(name={self.name!r}, node_id={self.node_id!r})"
+
+
+def _frame_path(frame: List[Any]) -> Optional[str]:
+    """Join a traversal frame's ancestor names into a " / " path, once"""
+    if frame[2] is _UNJOINED:
+        path_parts = frame[1]
+        frame[2] = ' / '.join(path_parts) if path_parts else None
+    return frame[2]
+
+
+# Hot traversal kept at module level so every lookup is a fast local
+# rather than a closure-cell dereference inside the importer methods
+def _walk_nodes(items: List[Any], supertags: Optional[Dict[str, Any]],
+                target_supertags: Dict[str, str], meta_node_to_supertag: Dict[str, str],
+                nodes_by_supertag: Dict[str, List[NodeInfo]]) -> None:
+    """Count supertag usage into supertags and collect target-tagged nodes in one walk"""
+    # supertags=None skips counting; empty target_supertags skips collection
+    count = supertags is not None
+
+    # Depth-first walk with an explicit stack so deep trees cannot hit the
+    # recursion limit. Each frame is [child iterator, ancestor names, joined
+    # path, collecting]; ancestors stay a tuple until a node in that frame
+    # matches, and collecting is False below supertag definitions.
+    stack = [[iter(items), (), _UNJOINED, bool(target_supertags)]]
+
+    # Target names each distinct (supertag id, supertag name) pair resolves to,
+    # in target_supertags order; filled on first sight so the per-node check
+    # is a dict probe instead of a scan over every target
+    target_matches: Dict[Tuple[str, str], Tuple[str, ...]] = {}
+
+    # Cheap rejection of supertags that cannot match any target
+    target_ids = frozenset(target_supertags.values())
+    target_lnames = frozenset(target_name.lower() for target_name in target_supertags)
+
+    while stack:
+        frame = stack[-1]
+        item = next(frame[0], _EXHAUSTED)
+        if item is _EXHAUSTED:
+            stack.pop()
+            continue
+
+        if not isinstance(item, dict):
+            continue
+
+        props = item.get('props', {})
+        is_tag_def = props.get('_docType') == 'tagDef'
+
+        if count:
+            # Handle Tagr format supertag definitions
+            if is_tag_def:
+                tag_id = item.get('id', '')
+                tag_name = props.get('name', '')
+
+                if tag_id and tag_name:
+                    if tag_id not in supertags:
+                        supertags[tag_id] = {
+                            'name': tag_name,
+                            'count': 0
+                        }
+                    # Don't increment count for definitions, only for usage
+
+            # Handle supertags array (Tana Intermediate Format)
+            elif 'supertags' in item:
+                for supertag in item.get('supertags', []):
+                    if isinstance(supertag, dict):
+                        tag_id = supertag.get('uid', supertag.get('id', ''))
+                        tag_name = supertag.get('name', '')
+
+                        if tag_id and tag_name:
+                            if tag_id not in supertags:
+                                supertags[tag_id] = {
+                                    'name': tag_name,
+                                    'count': 0
+                                }
+                            supertags[tag_id]['count'] += 1
+
+        # Supertag definition nodes (and everything below them) are never collected
+        collecting = frame[3] and not is_tag_def
+
+        if collecting:
+            # Check if this node has any target supertags via _metaNodeId
+            meta_node_id = props.get('_metaNodeId')
+            if meta_node_id and meta_node_id in meta_node_to_supertag:
+                supertag_name = meta_node_to_supertag[meta_node_id]
+
+                # Filter out supertag definition nodes
+                # These have names like "Field defaults for Everything tagged #X"
+                # and are not actual content nodes
+                node_name = props.get('name', '')
+                if not node_name.startswith('Field defaults for'):
+                    if supertag_name not in nodes_by_supertag:
+                        nodes_by_supertag[supertag_name] = []
+
+                    nodes_by_supertag[supertag_name].append(NodeInfo(
+                        node_name or 'Untitled',
+                        item.get('id', item.get('uid', 'unknown')),
+                        props.get('description', ''),
+                        props.get('created'),
+                        item.get('children', []),
+                        _frame_path(frame)
+                    ))
+
+            # Also check for direct supertag references (legacy format)
+            node_supertags = item.get('supertags', [])
+            for supertag in node_supertags:
+                if isinstance(supertag, dict):
+                    supertag_id = supertag.get('id', supertag.get('uid', ''))
+                    supertag_name = supertag.get('name', '')
+
+                    # Check if this matches any of our target supertags
+                    supertag_lname = supertag_name.lower()
+                    if supertag_id not in target_ids and supertag_lname not in target_lnames:
+                        continue
+
+                    match_key = (supertag_id, supertag_name)
+                    matched_targets = target_matches.get(match_key)
+                    if matched_targets is None:
+                        matched_targets = tuple(
+                            target_name for target_name, target_id in target_supertags.items()
+                            if supertag_id == target_id or supertag_lname == target_name.lower()
+                        )
+                        target_matches[match_key] = matched_targets
+
+                    for target_name in matched_targets:
+                        # Filter out supertag definition nodes
+                        node_name = props.get('name', '')
+                        if not node_name.startswith('Field defaults for'):
+                            if target_name not in nodes_by_supertag:
+                                nodes_by_supertag[target_name] = []
+
+                            nodes_by_supertag[target_name].append(NodeInfo(
+                                node_name or 'Untitled',
+                                item.get('id', item.get('uid', 'unknown')),
+                                props.get('description', ''),
+                                props.get('created'),
+                                item.get('children', []),
+                                _frame_path(frame)
+                            ))
+
+        # Descend into children, but only when they are nested nodes (id
+        # references in the export format carry nothing to count or collect)
+        # and only while this subtree still has something to do
+        if not (count or collecting):
+            continue
+        children = item.get('children', [])
+        if children and any(isinstance(child, dict) for child in children):
+            child_parts = ()
+            if collecting:
+                current_name = props.get('name', 'Untitled')
+                # An empty leading segment is dropped, matching the old
+                # f"{parent} / {name}" if parent else name behaviour
+                path_parts = frame[1]
+                if path_parts and path_parts[0]:
+                    child_parts = path_parts + (current_name,)
+                else:
+                    child_parts = (current_name,)
+            stack.append([iter(children), child_parts, _UNJOINED, collecting])
+
+
 class TanaImporter:
     """Core Tana import functionality"""
 
     def __init__(self, files_dir: Path = None):
         """Initialize with custom files directory"""
         self.tana_io = TanaIO(files_dir)
+        self._doc_lookup: Optional[Dict[str, Any]] = None
+        self._doc_lookup_source: Optional[Dict[str, Any]] = None
+        # (data, keytags_data, supertags, nodes_by_supertag) from the last tree walk
+        self._walk_cache: Optional[Tuple[Any, ...]] = None
+        # Footer text per source file; the file is stat'ed once per import
+        self._footers: Dict[Path, str] = {}
+        # Rendered child links/content, valid for one create_supertag_directories run
+        self._child_content_cache: Dict[str, str] = {}
+        self._child_content_lookup: Optional[Dict[str, Any]] = None
+
+    def _footer(self, source_file: Optional[Path]) -> str:
+        """Return the markdown footer for source_file, computing it once per import"""
+        if source_file is None:
+            return ''
+        footer = self._footers.get(source_file)
+        if footer is None:
+            footer = self._footers[source_file] = markdown_footer(source_file)
+        return footer
+
+    def _get_doc_lookup(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the id -> doc lookup for data, building it once per import"""
+        if self._doc_lookup is None or self._doc_lookup_source is not data:
+            docs = data.get('docs', data.get('nodes', []))
+            self._doc_lookup = {doc.get('id'): doc for doc in docs}
+            self._doc_lookup_source = data
+        return self._doc_lookup
 
     def extract_all_supertags(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Extract all supertags and count occurrences"""
-        supertags = {}
+        # Reuse the counts from a walk extract_nodes_by_supertag already did
+        cache = self._walk_cache
+        if cache is not None and cache[0] is data:
+            return cache[2]
 
-        # Handle different Tana JSON formats
-        nodes = data.get('nodes', data.get('docs', []))
+        supertags, _ = self._walk_once(data, {})
+        return supertags
 
-        def extract_and_count(items):
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
+    def _walk_once(self, data: Dict[str, Any],
+                   keytags_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, List[NodeInfo]]]:
+        """Count all supertags and group target nodes by supertag in a single tree walk"""
+        cache = self._walk_cache
+        if cache is not None and cache[0] is data and cache[1] is keytags_data:
+            return cache[2], cache[3]
 
-                # Handle Tagr format supertag definitions
-                props = item.get('props', {})
-                if props.get('_docType') == 'tagDef':
-                    tag_id = item.get('id', '')
-                    tag_name = props.get('name', '')
-
-                    if tag_id and tag_name:
-                        if tag_id not in supertags:
-                            supertags[tag_id] = {
-                                'name': tag_name,
-                                'count': 0
-                            }
-                        # Don't increment count for definitions, only for usage
-
-                # Handle supertags array (Tana Intermediate Format)
-                elif 'supertags' in item:
-                    for supertag in item.get('supertags', []):
-                        if isinstance(supertag, dict):
-                            tag_id = supertag.get('uid', supertag.get('id', ''))
-                            tag_name = supertag.get('name', '')
-
-                            if tag_id and tag_name:
-                                if tag_id not in supertags:
-                                    supertags[tag_id] = {
-                                        'name': tag_name,
-                                        'count': 0
-                                    }
-                                supertags[tag_id]['count'] += 1
-
-                # Recursively process children
-                children = item.get('children', [])
-                if children:
-                    extract_and_count(children)
-
-        # Start extraction
-        extract_and_count(nodes)
+        # Get target supertags from keytags
+        target_supertags = {}
+        for tag_data in keytags_data.get('supertags', {}).get('user_defined', {}).values():
+            tag_name = tag_data.get('name', '')
+            if tag_name:
+                target_supertags[tag_name] = tag_data.get('node_id', '')
 
-        return supertags
+        # Nothing can match without target supertags, so skip the metanode pass
+        meta_node_to_supertag = {}
+        if target_supertags:
+            meta_node_to_supertag = self._build_meta_node_map(data, target_supertags)
+
+        supertags = {}
+        nodes_by_supertag = {}
+
+        # Handle different Tana JSON formats. Supertag counting has always
+        # preferred 'nodes' and node extraction 'docs'; they are the same list
+        # unless an export carries both keys.
+        count_items = data.get('nodes', data.get('docs', []))
+        collect_items = data.get('docs', data.get('nodes', []))
+        if count_items is collect_items:
+            _walk_nodes(collect_items, supertags, target_supertags, meta_node_to_supertag, nodes_by_supertag)
+        else:
+            _walk_nodes(count_items, supertags, {}, {}, {})
+            _walk_nodes(collect_items, None, target_supertags, meta_node_to_supertag, nodes_by_supertag)
+
+        self._walk_cache = (data, keytags_data, supertags, nodes_by_supertag)
+        return supertags, nodes_by_supertag
 
     def create_supertags_md(self, supertags: Dict[str, Any], export_dir: Path, source_file: Path = None) -> None:
         """Create SuperTags.md with all supertags and usage counts"""
@@ -90,16 +324,18 @@ class TanaImporter:
             if not tag_id.startswith('SYS_')
         }
 
-        content = [
-            "# SuperTags Analysis",
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Total unique supertags: {len(supertags)}",
-            f"Showing: {len(user_defined)} user-defined supertags (excluding system tags)",
-            "---",
-            "",
-            "| Supertag Name | Node ID | Usage Count |",
-            "|---------------|---------|-------------|"
-        ]
+        # Rows are streamed into a StringIO rather than collected in a list
+        # of thousands of strings and joined afterwards
+        buf = io.StringIO()
+        w = buf.write
+        w("# SuperTags Analysis\n"
+          f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+          f"Total unique supertags: {len(supertags)}\n"
+          f"Showing: {len(user_defined)} user-defined supertags (excluding system tags)\n"
+          "---\n"
+          "\n"
+          "| Supertag Name | Node ID | Usage Count |\n"
+          "|---------------|---------|-------------|")
 
         # Sort by count descending
         sorted_supertags = sorted(
@@ -111,13 +347,14 @@ class TanaImporter:
         for tag_id, tag_data in sorted_supertags:
             name = tag_data.get('name', 'Unknown')
             count = tag_data.get('count', 0)
-            content.append(f"| {name} | `{tag_id}` [(tana)](https://app.tana.inc?nodeid={tag_id}) | {count} |")
+            w(f"\n| {name} | `{tag_id}` [(tana)](https://app.tana.inc?nodeid={tag_id}) | {count} |")
 
-        content = add_markdown_footer(content, source_file)
+        footer = self._footer(source_file)
+        if footer:
+            w("\n" + footer)
 
         supertags_file = export_dir / "SuperTags.md"
-        with open(supertags_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content))
+        _write_markdown(supertags_file, buf.getvalue())
 
     def find_home_node(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Find the home/root node in the Tana data"""
@@ -129,8 +366,7 @@ class TanaImporter:
                 continue
 
             # Check for home-like patterns
-            name = doc.get('name', '').lower()
-            if any(pattern in name for pattern in ['home', 'root', 'main', 'start']):
+            if _HOME_NAME_RE.search(doc.get('name', '')):
                 return doc
 
         # Return first doc as fallback
@@ -167,11 +403,12 @@ class TanaImporter:
                 ""
             ])
 
-        content = add_markdown_footer(content, source_file)
+        footer = self._footer(source_file)
+        if footer:
+            content.append(footer)
 
         home_file = export_dir / "Home.md"
-        with open(home_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(content))
+        _write_markdown(home_file, '\n'.join(content))
 
     def load_keytags(self, files_dir: Path) -> Dict[str, Any]:
         """Load keytags.json file"""
@@ -183,8 +420,7 @@ class TanaImporter:
             return {}
 
         try:
-            with open(keytags_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return json_backend.load_path(keytags_file)
         except json.JSONDecodeError as e:
             Colors.error(f"Invalid JSON in keytags file: {e}")
             return {}
@@ -192,17 +428,13 @@ class TanaImporter:
             Colors.error(f"Error loading keytags file: {e}")
             return {}
 
-    def extract_nodes_by_supertag(self, data: Dict[str, Any], keytags_data: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    def extract_nodes_by_supertag(self, data: Dict[str, Any], keytags_data: Dict[str, Any]) -> Dict[str, List[NodeInfo]]:
         """Extract all nodes grouped by their supertags"""
-        nodes_by_supertag = {}
-
-        # Get target supertags from keytags
-        target_supertags = {}
-        for tag_data in keytags_data.get('supertags', {}).get('user_defined', {}).values():
-            tag_name = tag_data.get('name', '')
-            if tag_name:
-                target_supertags[tag_name] = tag_data.get('node_id', '')
+        _, nodes_by_supertag = self._walk_once(data, keytags_data)
+        return nodes_by_supertag
 
+    def _build_meta_node_map(self, data: Dict[str, Any], target_supertags: Dict[str, str]) -> Dict[str, str]:
+        """Map metanode IDs to the target supertag names they reference"""
         # Handle different Tana JSON formats
         docs = data.get('docs', data.get('nodes', []))
 
@@ -211,11 +443,14 @@ class TanaImporter:
         # through a metanode hierarchy: Node -> metanode -> tuple -> supertag
         meta_node_to_supertag = {}
 
-        # Create efficient lookup
-        doc_lookup = {doc.get('id'): doc for doc in docs}
+        # Create efficient lookup (shared with create_supertag_directories)
+        doc_lookup = self._get_doc_lookup(data)
 
-        # Build target supertag ID set
-        target_supertag_ids = set(target_supertags.values())
+        # Map target supertag IDs back to their names (first name wins, as the
+        # old linear scan over target_supertags did)
+        target_supertag_ids = {}
+        for supertag_name, supertag_id in target_supertags.items():
+            target_supertag_ids.setdefault(supertag_id, supertag_name)
 
         print(f"  Building metanode mappings for {len(target_supertag_ids)} target supertags...")
 
@@ -235,134 +470,61 @@ class TanaImporter:
 
                 child_children = child_doc.get('children', [])
                 for grandchild_id in child_children:
-                    if grandchild_id in target_supertag_ids:
+                    supertag_name = target_supertag_ids.get(grandchild_id)
+                    if supertag_name is not None:
                         # Found mapping!
-                        for supertag_name, supertag_id in target_supertags.items():
-                            if grandchild_id == supertag_id:
-                                meta_node_to_supertag[doc_id] = supertag_name
-                                break
-
-        def traverse_nodes(items, parent_path=None):
-            for item in items:
-                if not isinstance(item, dict):
-                    continue
-
-                props = item.get('props', {})
-
-                # Skip supertag definition nodes themselves
-                if props.get('_docType') == 'tagDef':
-                    continue
-
-                # Check if this node has any target supertags via _metaNodeId
-                meta_node_id = props.get('_metaNodeId')
-                if meta_node_id and meta_node_id in meta_node_to_supertag:
-                    supertag_name = meta_node_to_supertag[meta_node_id]
-
-                    # Filter out supertag definition nodes
-                    # These have names like "Field defaults for Everything tagged #X"
-                    # and are not actual content nodes
-                    node_name = props.get('name', '')
-                    if not node_name.startswith('Field defaults for'):
-                        if supertag_name not in nodes_by_supertag:
-                            nodes_by_supertag[supertag_name] = []
-
-                        nodes_by_supertag[supertag_name].append({
-                            'name': node_name or 'Untitled',
-                            'node_id': item.get('id', item.get('uid', 'unknown')),
-                            'description': props.get('description', ''),
-                            'created': props.get('created'),
-                            'children': item.get('children', []),
-                            'path': parent_path
-                        })
-
-                # Also check for direct supertag references (legacy format)
-                node_supertags = item.get('supertags', [])
-                for supertag in node_supertags:
-                    if isinstance(supertag, dict):
-                        supertag_id = supertag.get('id', supertag.get('uid', ''))
-                        supertag_name = supertag.get('name', '')
-
-                        # Check if this matches any of our target supertags
-                        for target_name, target_id in target_supertags.items():
-                            if (supertag_id == target_id or
-                                supertag_name.lower() == target_name.lower()):
-
-                                # Filter out supertag definition nodes
-                                node_name = props.get('name', '')
-                                if not node_name.startswith('Field defaults for'):
-                                    if target_name not in nodes_by_supertag:
-                                        nodes_by_supertag[target_name] = []
-
-                                    nodes_by_supertag[target_name].append({
-                                        'name': node_name or 'Untitled',
-                                        'node_id': item.get('id', item.get('uid', 'unknown')),
-                                        'description': props.get('description', ''),
-                                        'created': props.get('created'),
-                                        'children': item.get('children', []),
-                                        'path': parent_path
-                                    })
-
-                # Recursively process children
-                children = item.get('children', [])
-                if children:
-                    current_name = props.get('name', 'Untitled')
-                    current_path = f"{parent_path} / {current_name}" if parent_path else current_name
-                    traverse_nodes(children, current_path)
-
-        # Start traversal
-        traverse_nodes(docs)
+                        meta_node_to_supertag[doc_id] = supertag_name
 
-        return nodes_by_supertag
+        return meta_node_to_supertag
 
-    def format_node_content(self, node_info: Dict[str, Any]) -> str:
+    def format_node_content(self, node_info: NodeInfo) -> str:
         """Format node content as markdown"""
-        content = []
-
-        # Node name (title)
-        node_name = node_info.get('name', 'Untitled')
-        content.append(f"# {node_name}")
-
-        # Node metadata
-        node_id = node_info.get('node_id', 'unknown')
-        content.append(f"**Node ID:** `{node_id}`")
-
-        # Description
-        description = node_info.get('description', '')
-        if description and description.strip():
-            content.append(f"**Description:** {description}")
+        # Optional metadata lines are built as (possibly empty) strings and the
+        # page is assembled with a single f-string instead of a list + join
+        description = node_info.description
+        description_line = f"**Description:** {description}\n" if description and description.strip() else ''
 
-        # Created date
-        created = node_info.get('created')
+        created = node_info.created
+        created_line = ''
         if created:
-            if isinstance(created, str):
-                # ISO format string
-                content.append(f"**Created:** {created}")
-            else:
-                # Timestamp in milliseconds
-                created_date = datetime.fromtimestamp(created/1000).strftime('%Y-%m-%d %H:%M:%S')
-                content.append(f"**Created:** {created_date}")
-
-        # Path
-        path = node_info.get('path', '')
-        if path:
-            content.append(f"**Path:** {path}")
-
-        content.append("---")
-        content.append("")
+            if not isinstance(created, str):
+                # Timestamp in milliseconds (strings are already ISO formatted)
+                created = datetime.fromtimestamp(created/1000).strftime('%Y-%m-%d %H:%M:%S')
+            created_line = f"**Created:** {created}\n"
+
+        path = node_info.path
+        path_line = f"**Path:** {path}\n" if path else ''
+
+        markdown = (
+            f"# {node_info.name}\n"
+            f"**Node ID:** `{node_info.node_id}`\n"
+            f"{description_line}{created_line}{path_line}"
+            "---\n"
+        )
 
         # Children and subnodes as structured data
-        children = node_info.get('children', [])
+        children = node_info.children
         if children:
-            content.append("## 📋 Content & Subnodes")
-            content.extend(self.format_children_as_data(children))
+            markdown += "\n## 📋 Content & Subnodes"
+            child_lines = self.format_children_as_data(children)
+            if child_lines:
+                markdown += "\n" + "\n".join(child_lines)
 
-        return '\n'.join(content)
+        return markdown
 
     def format_children_as_data(self, children: List[Any], level: int = 0) -> List[str]:
         """Format child nodes as structured data in markdown"""
         content = []
 
-        for child in children:
+        # Walk the tree with an explicit stack of child iterators so deep
+        # exports cannot hit the recursion limit
+        stack = [iter(children)]
+        while stack:
+            child = next(stack[-1], _EXHAUSTED)
+            if child is _EXHAUSTED:
+                stack.pop()
+                continue
+
             if isinstance(child, str):
                 # This is a reference to another node
                 content.append(f"- **Reference:** `{child}`")
@@ -401,10 +563,10 @@ class TanaImporter:
                 content.append("```")
                 content.append("")
 
-                # Recursively process children
+                # Descend into children before moving on to the next sibling
                 child_children = child.get('children', [])
                 if child_children:
-                    content.extend(self.format_children_as_data(child_children, level + 1))
+                    stack.append(iter(child_children))
 
         return content
 
@@ -412,89 +574,131 @@ class TanaImporter:
         """Format child nodes as markdown (legacy method)"""
         content = []
 
-        for child in children:
+        # Explicit stack of (child iterator, level, indents) frames instead of
+        # recursion; the three indent strings are built once per level
+        stack = [(iter(children), level, _indents(level))]
+        while stack:
+            child_iter, current_level, (ref_indent, item_indent, desc_indent) = stack[-1]
+            child = next(child_iter, _EXHAUSTED)
+            if child is _EXHAUSTED:
+                stack.pop()
+                continue
+
             if isinstance(child, str):
                 # This is a reference to another node
-                content.append(f"{'  ' * level}  - Referenced node: `{child}`")
+                content.append(f"{ref_indent}  - Referenced node: `{child}`")
                 continue
 
             if isinstance(child, dict):
                 child_name = child.get('name', 'Untitled')
                 child_id = child.get('id', child.get('uid', 'unknown'))
 
-                content.append(f"{'  ' * (level + 1)}- **{child_name}** (`{child_id}`)")
+                content.append(f"{item_indent}- **{child_name}** (`{child_id}`)")
 
                 # Add description if available
                 child_desc = child.get('description', '')
                 if child_desc and child_desc.strip():
-                    content.append(f"{'  ' * (level + 2)}- {child_desc}")
+                    content.append(f"{desc_indent}- {child_desc}")
 
-                # Recursively process children
+                # Descend into children before moving on to the next sibling
                 child_children = child.get('children', [])
                 if child_children:
-                    content.extend(self.format_children(child_children, level + 2))
+                    stack.append((iter(child_children), current_level + 2, _indents(current_level + 2)))
 
         return content
 
-    def create_supertag_directories(self, nodes_by_supertag: Dict[str, List[Dict[str, Any]]], export_dir: Path, data: Dict[str, Any] = None) -> int:
+    def create_supertag_directories(self, nodes_by_supertag: Dict[str, List[NodeInfo]], export_dir: Path, data: Dict[str, Any] = None) -> int:
         """Create directories and markdown files for each supertag with index + individual node files"""
         total_files_created = 0
 
         # Create doc_lookup for efficient child content resolution
-        doc_lookup = {}
-        if data:
-            docs = data.get('docs', data.get('nodes', []))
-            doc_lookup = {doc.get('id'): doc for doc in docs}
-
-        for supertag_name, nodes in nodes_by_supertag.items():
-            if not nodes:
-                continue
-
-            # Create directory (replace spaces with hyphens and lowercase)
-            dir_name = supertag_name.replace(' ', '-').lower()
-            supertag_dir = export_dir / dir_name
-            supertag_dir.mkdir(parents=True, exist_ok=True)
-
-            Colors.info(f"📁 Creating {len(nodes)} files in '{supertag_name}' directory")
-
-            # First, create all individual node files using node ID as filename
-            node_files = {}
-            for node_info in nodes:
-                node_id = node_info.get('node_id', 'unknown')
-                filename = f"{node_id}.md"
-                file_path = supertag_dir / filename
-
-                # Format content with the new structure
-                markdown_content = self.format_node_content_new(node_info, supertag_name, doc_lookup)
-
-                # Write individual node file
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(markdown_content)
-
-                node_files[node_id] = {
-                    'name': node_info.get('name', 'Untitled'),
-                    'filename': filename,
-                    'created': node_info.get('created'),
-                    'description': node_info.get('description', '')
-                }
-                total_files_created += 1
-
-            # Create index file for the supertag
-            index_content = self.create_supertag_index(supertag_name, node_files)
-            index_path = supertag_dir / f"{supertag_name.replace(' ', '-').lower()}.md"
+        doc_lookup = self._get_doc_lookup(data) if data else {}
+
+        # Children are often shared between nodes, so render each one once per run
+        self._child_content_cache = {}
+        self._child_content_lookup = doc_lookup
+
+        # Markdown is rendered on this thread while a pool performs the file
+        # writes, so open/write/close syscalls for every directory overlap
+        # with formatting instead of waiting at each directory boundary
+        with ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as write_pool:
+            pending_writes = {}
+            queued_dirs = []
+            for supertag_name, nodes in nodes_by_supertag.items():
+                if not nodes:
+                    continue
 
-            with open(index_path, 'w', encoding='utf-8') as f:
-                f.write(index_content)
+                writes = self._queue_supertag_directory(
+                    supertag_name, nodes, export_dir, doc_lookup, write_pool, pending_writes
+                )
+                queued_dirs.append((supertag_name, len(nodes) + 1, writes))
+                total_files_created += len(nodes) + 1
 
-            total_files_created += 1
-            Colors.success(f"✅ Created {len(nodes) + 1} files in '{supertag_name}' directory")
+            # Report each directory once its writes have landed, so errors
+            # surface before its success message
+            for supertag_name, file_count, writes in queued_dirs:
+                for write in writes:
+                    write.result()
+                Colors.success(f"✅ Created {file_count} files in '{supertag_name}' directory")
 
         return total_files_created
 
-    def create_supertag_index(self, supertag_name: str, node_files: Dict[str, Dict[str, Any]]) -> str:
-        """Create an index file for a supertag with links to all node files"""
+    def _queue_supertag_directory(self, supertag_name: str, nodes: List[NodeInfo], export_dir: Path,
+                                  doc_lookup: Dict[str, Any], write_pool: ThreadPoolExecutor,
+                                  pending_writes: Dict[str, Future]) -> List[Future]:
+        """Create one supertag directory and queue its node files and index for writing"""
+        # Create directory (replace spaces with hyphens and lowercase)
+        dir_name = supertag_name.replace(' ', '-').lower()
+        supertag_dir = export_dir / dir_name
+        # Title-case once per supertag rather than once per generated file
+        supertag_title = supertag_name.title()
+        supertag_dir.mkdir(parents=True, exist_ok=True)
+
+        Colors.info(f"📁 Creating {len(nodes)} files in '{supertag_name}' directory")
+
+        # First, create all individual node files using node ID as filename.
+        # Paths are plain string concatenation: building a Path object per
+        # file is measurable overhead with thousands of nodes.
+        dir_prefix = f"{supertag_dir}{os.sep}"
+        node_files = {}
+        writes = []
+        for node_info in nodes:
+            node_id = node_info.node_id
+            file_path = f"{dir_prefix}{node_id}.md"
+
+            # Format content with the new structure
+            markdown_content = self.format_node_content_new(node_info, supertag_title, doc_lookup)
+
+            # Write individual node file
+            writes.append(self._submit_write(write_pool, pending_writes, file_path, markdown_content))
+
+            node_files[node_id] = node_info
+
+        # Create index file for the supertag
+        index_content = self.create_supertag_index(supertag_title, node_files)
+        index_path = f"{dir_prefix}{dir_name}.md"
+
+        writes.append(self._submit_write(write_pool, pending_writes, index_path, index_content))
+
+        return writes
+
+    @staticmethod
+    def _submit_write(write_pool: ThreadPoolExecutor, pending_writes: Dict[str, Future],
+                      file_path: str, content: str) -> Future:
+        """Queue a markdown write, finishing any earlier write to the same file first"""
+        # Supertags that differ only in case share a directory, so the same
+        # path can be queued twice; the later content must win, as it did
+        # when files were written sequentially
+        previous = pending_writes.get(file_path)
+        if previous is not None:
+            previous.result()
+        pending_writes[file_path] = write_pool.submit(_write_markdown, file_path, content)
+        return pending_writes[file_path]
+
+    def create_supertag_index(self, supertag_title: str, node_files: Dict[str, NodeInfo]) -> str:
+        """Create an index file for a supertag (given its title-cased name) with links to all node files"""
         content = []
-        content.append(f"# {supertag_name.title()}")
+        content.append(f"# {supertag_title}")
         content.append(f"")
         content.append(f"**Total nodes:** {len(node_files)}")
         content.append("")
@@ -502,13 +706,13 @@ class TanaImporter:
         content.append("")
 
         # Sort nodes by name
-        sorted_nodes = sorted(node_files.items(), key=lambda x: x[1]['name'].lower())
+        sorted_nodes = sorted(node_files.items(), key=lambda x: x[1].name.lower())
 
         for node_id, node_info in sorted_nodes:
-            name = node_info['name']
-            filename = node_info['filename']
-            description = node_info.get('description', '')
-            created = node_info.get('created')
+            name = node_info.name
+            filename = f"{node_id}.md"
+            description = node_info.description
+            created = node_info.created
 
             # Create Obsidian-style link
             content.append(f"- [[{filename}|{name}]]")
@@ -529,29 +733,29 @@ class TanaImporter:
 
         return '\n'.join(content)
 
-    def format_node_content_new(self, node_info: Dict[str, Any], supertag_name: str, doc_lookup: Dict[str, Any] = None) -> str:
+    def format_node_content_new(self, node_info: NodeInfo, supertag_title: str, doc_lookup: Dict[str, Any] = None) -> str:
         """Format node content as markdown with the new structure, preserving formatting"""
         content = []
 
         # Node name (title) - this is the main heading
-        node_name = node_info.get('name', 'Untitled')
+        node_name = node_info.name
         content.append(f"# {node_name}")
         content.append("")
 
         # Supertags section
         content.append(f"## 🏷️ Supertags")
-        content.append(f"- **{supertag_name.title()}**")
+        content.append(f"- **{supertag_title}**")
         content.append("")
 
         # Children section - preserve formatting and content
-        children = node_info.get('children', [])
+        children = node_info.children
         if children:
             content.append("## 📋 Children")
             content.append("")
 
             # We need to get the full child data to preserve content
             for child_id in children:
-                child_content = self.get_child_content(child_id, node_info.get('node_id'), doc_lookup)
+                child_content = self.get_child_content(child_id, node_info.node_id, doc_lookup)
                 if child_content:
                     content.append(child_content)
 
@@ -559,10 +763,10 @@ class TanaImporter:
 
         # Node metadata (collapsible)
         content.append("## 📝 Node Details")
-        content.append(f"**Node ID:** `{node_info.get('node_id', 'unknown')}`")
+        content.append(f"**Node ID:** `{node_info.node_id}`")
 
         # Created date
-        created = node_info.get('created')
+        created = node_info.created
         if created:
             if isinstance(created, str):
                 content.append(f"**Created:** {created}")
@@ -571,12 +775,12 @@ class TanaImporter:
                 content.append(f"**Created:** {created_date}")
 
         # Description
-        description = node_info.get('description', '')
+        description = node_info.description
         if description and description.strip():
             content.append(f"**Description:** {description}")
 
         # Path
-        path = node_info.get('path', '')
+        path = node_info.path
         if path:
             content.append(f"**Path:** {path}")
 
@@ -584,6 +788,19 @@ class TanaImporter:
 
     def get_child_content(self, child_id: str, parent_node_id: str, doc_lookup: Dict[str, Any] = None) -> str:
         """Get child content preserving formatting, returning markdown"""
+        # The result only depends on child_id and doc_lookup, so reuse it while
+        # the lookup is the one the current export run is using
+        if doc_lookup and doc_lookup is self._child_content_lookup:
+            cached = self._child_content_cache.get(child_id)
+            if cached is None:
+                cached = self._render_child_content(child_id, doc_lookup)
+                self._child_content_cache[child_id] = cached
+            return cached
+
+        return self._render_child_content(child_id, doc_lookup)
+
+    def _render_child_content(self, child_id: str, doc_lookup: Optional[Dict[str, Any]]) -> str:
+        """Render a single child reference or inline content as markdown"""
         if not doc_lookup:
             # Fallback if no doc lookup available
             return f"- [[{child_id}.md]]"
@@ -636,8 +853,6 @@ class TanaImporter:
 
     def sanitize_filename(self, filename: str) -> str:
         """Sanitize filename for filesystem compatibility"""
-        import re
-
         # Replace problematic characters with underscores or remove them
         # Keep letters, numbers, spaces, hyphens, underscores, and parentheses
         sanitized = re.sub(r'[^\w\s\-\(\)]', '', filename)
@@ -666,7 +881,7 @@ class TanaImporter:
         return sanitized
 
     def create_import_summary(self, import_file: Path, supertags: List[Dict[str, Any]], keytags_data: Dict[str, Any],
-                             nodes_by_supertag: Dict[str, List[Dict[str, Any]]], total_markdown_files: int,
+                             nodes_by_supertag: Dict[str, List[NodeInfo]], total_markdown_files: int,
                              export_dir: Path, issues: List[Dict[str, Any]] = None) -> Path:
         """Create import-summary.md with detailed metrics and issues"""
 
@@ -676,100 +891,107 @@ class TanaImporter:
         else:
             supertag_list = supertags
 
-        summary = [
-            "# Import Summary",
-            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
-            f"Source File: {import_file.name}",
-            f"File Size: {import_file.stat().st_size:,} bytes",
-            f"Modified: {datetime.fromtimestamp(import_file.stat().st_mtime).strftime('%Y-%m-%d %H:%M:%S')}",
-            "",
-            "## 📊 Key Metrics",
-            "",
-            f"- **Total Supertags Found:** {len(supertag_list)}",
-            f"- **User-defined Supertags:** {len([s for s in supertag_list if not s.get('name', '').startswith('SYS_')])}",
-            f"- **System Supertags:** {len([s for s in supertag_list if s.get('name', '').startswith('SYS_')])}",
-            f"- **KeyTags Loaded:** {keytags_data.get('total_supertags', 0)}",
-            f"- **Target Supertags:** {len(keytags_data.get('supertags', {}).get('user_defined', {}))}",
-            f"- **Nodes Processed:** {total_markdown_files}",
-            f"- **Directories Created:** {len(nodes_by_supertag)}",
-            "",
-            "## 📁 Directory Structure",
-            ""
-        ]
+        # Count system vs user-defined supertags in a single pass
+        system_count = sum(1 for s in supertag_list if s.get('name', '').startswith('SYS_'))
+        user_count = len(supertag_list) - system_count
+
+        import_stat = import_file.stat()
+
+        # Every line is written with its newline into one StringIO buffer
+        buf = io.StringIO()
+        w = buf.write
+        w("# Import Summary\n"
+          f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+          f"Source File: {import_file.name}\n"
+          f"File Size: {import_stat.st_size:,} bytes\n"
+          f"Modified: {datetime.fromtimestamp(import_stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')}\n"
+          "\n"
+          "## 📊 Key Metrics\n"
+          "\n"
+          f"- **Total Supertags Found:** {len(supertag_list)}\n"
+          f"- **User-defined Supertags:** {user_count}\n"
+          f"- **System Supertags:** {system_count}\n"
+          f"- **KeyTags Loaded:** {keytags_data.get('total_supertags', 0)}\n"
+          f"- **Target Supertags:** {len(keytags_data.get('supertags', {}).get('user_defined', {}))}\n"
+          f"- **Nodes Processed:** {total_markdown_files}\n"
+          f"- **Directories Created:** {len(nodes_by_supertag)}\n"
+          "\n"
+          "## 📁 Directory Structure\n"
+          "\n")
 
         # Add directory details
         if nodes_by_supertag:
             for supertag_name in sorted(nodes_by_supertag.keys()):
                 node_count = len(nodes_by_supertag[supertag_name])
                 dir_name = supertag_name.replace(' ', '-').lower()
-                summary.append(f"- **{dir_name}/**: {node_count} files")
+                w(f"- **{dir_name}/**: {node_count} files\n")
 
-            summary.append("")
+            w("\n")
 
         # Add KeyTags details
-        summary.extend([
-            "## 🏷️ KeyTags Processed",
-            ""
-        ])
+        w("## 🏷️ KeyTags Processed\n"
+          "\n")
 
         user_defined = keytags_data.get('supertags', {}).get('user_defined', {})
         if user_defined:
-            summary.append("| Supertag Name | Node ID | Files Created |")
-            summary.append("|---------------|---------|---------------|")
+            w("| Supertag Name | Node ID | Files Created |\n"
+              "|---------------|---------|---------------|\n")
 
             for tag_id, tag_data in user_defined.items():
                 tag_name = tag_data.get('name', 'Unknown')
                 files_created = len(nodes_by_supertag.get(tag_name, []))
-                summary.append(f"| {tag_name} | `{tag_id}` [(tana)](https://app.tana.inc?nodeid={tag_id}) | {files_created} |")
+                w(f"| {tag_name} | `{tag_id}` [(tana)](https://app.tana.inc?nodeid={tag_id}) | {files_created} |\n")
 
-            summary.append("")
+            w("\n")
 
         # Add issues if any
         if issues:
-            summary.extend([
-                "## ⚠️ Issues and Warnings",
-                ""
-            ])
+            w("## ⚠️ Issues and Warnings\n"
+              "\n")
 
             for issue in issues:
                 severity = issue.get('severity', 'INFO')
                 icon = {"ERROR": "❌", "WARNING": "⚠️", "INFO": "ℹ️"}.get(severity, "•")
-                summary.append(f"- {icon} **{severity}:** {issue.get('message', 'Unknown issue')}")
+                w(f"- {icon} **{severity}:** {issue.get('message', 'Unknown issue')}\n")
                 if issue.get('details'):
-                    summary.append(f"  - *{issue['details']}*")
+                    w(f"  - *{issue['details']}*\n")
 
-            summary.append("")
+            w("\n")
 
         # Add next steps
-        summary.extend([
-            "## 🎯 Next Steps",
-            "",
-            "1. Review the generated markdown files in each supertag directory",
-            "2. Check for any nodes that may need manual cleanup",
-            "3. Verify that Node IDs are correctly preserved",
-            "4. Consider updating any cross-references between nodes",
-            "",
-            "## 📋 Generated Files",
-            "",
-            f"- **SuperTags.md**: Complete analysis of all {len(supertag_list)} supertags found",
-            f"- **Home.md**: Home node information",
-            f"- **import-summary.md**: This summary file",
-            "",
-            f"**Total markdown files created:** {total_markdown_files + 3}",
-            ""
-        ])
+        w("## 🎯 Next Steps\n"
+          "\n"
+          "1. Review the generated markdown files in each supertag directory\n"
+          "2. Check for any nodes that may need manual cleanup\n"
+          "3. Verify that Node IDs are correctly preserved\n"
+          "4. Consider updating any cross-references between nodes\n"
+          "\n"
+          "## 📋 Generated Files\n"
+          "\n"
+          f"- **SuperTags.md**: Complete analysis of all {len(supertag_list)} supertags found\n"
+          "- **Home.md**: Home node information\n"
+          "- **import-summary.md**: This summary file\n"
+          "\n"
+          f"**Total markdown files created:** {total_markdown_files + 3}\n")
 
         # Write summary to file
         summary_file = export_dir / "import-summary.md"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(summary))
+        _write_markdown(summary_file, buf.getvalue())
 
         return summary_file
 
     def import_file(self, import_file: Path, clear_export: bool = True) -> Dict[str, Any]:
         """Import a Tana JSON file and return summary"""
+        # Drop any doc lookup, tree walk or footers cached from a previous import
+        self._doc_lookup = None
+        self._doc_lookup_source = None
+        self._walk_cache = None
+        self._footers = {}
+
         # Validate and load Tana JSON
-        data = self.tana_io.load_tana_file(import_file)
+        data, valid = self.tana_io.load_and_validate(import_file)
+        if not valid:
+            Colors.error(f"Not a Tana JSON file (expected 'docs', or 'version' and 'nodes'): {import_file}")
 
         # Clear export directory if requested
         if clear_export and self.tana_io.export_dir.exists():
@@ -777,12 +999,11 @@ class TanaImporter:
             shutil.rmtree(self.tana_io.export_dir)
         self.tana_io.export_dir.mkdir(parents=True, exist_ok=True)
 
-        # Extract and process supertags
-        supertags = self.extract_all_supertags(data)
-
-        # Load keytags and process nodes by supertag
+        # Load keytags, then count supertags and group nodes by supertag in
+        # one walk (extract_all_supertags reuses the walk's counts)
         keytags_data = self.load_keytags(self.tana_io.files_dir)
         nodes_by_supertag = self.extract_nodes_by_supertag(data, keytags_data)
+        supertags = self.extract_all_supertags(data)
 
         # Create directory structure
         total_markdown_files = self.create_supertag_directories(nodes_by_supertag, self.tana_io.export_dir, data)
@@ -1,18 +1,217 @@
 """Tana file I/O operations"""
 
+import codecs
+import fnmatch
 import json
+import mmap
+import os
+import re
+import shutil
 import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from functools import cached_property, lru_cache
+from typing import Dict, Any, Iterator, List, Optional, Pattern, Tuple, Union
 
 from .colors import Colors
+from . import json_backend
 
 # Default paths
 DEFAULT_FILES_DIR = Path("./files")
 DEFAULT_EXPORT_DIR = DEFAULT_FILES_DIR / "export"  # For markdown exports
 DEFAULT_IMPORT_DIR = DEFAULT_FILES_DIR / "import"  # For Tana JSON imports
 
+# Read size for keyword scans in search_files
+SEARCH_CHUNK_SIZE = 1024 * 1024
+
+# The only non-ASCII characters whose lowercase form contains ASCII letters,
+# as (UTF-8, lowercased UTF-8) pairs for keyword scans over raw bytes
+_ASCII_LOWERCASE_FOLDS = tuple((c.encode('utf-8'), c.lower().encode('utf-8')) for c in '\u0130\u212a')
+
+# Thread count for scanning files in search_files
+_SEARCH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Parsed Tana files keyed by (absolute path, mtime_ns, size), oldest first.
+# Parsed exports can be large, so only a few are kept.
+_PARSE_CACHE_SIZE = 4
+_parse_cache: "OrderedDict[Tuple[str, int, int], Any]" = OrderedDict()
+
+
+class FileInfo:
+    """Listing record for a file; the modified datetime is only built when read"""
+
+    __slots__ = ('path', 'name', 'size', 'mtime', 'is_tana', 'matches')
+
+    def __init__(self, path: str, name: str, size: int, mtime: float, is_tana: bool,
+                 matches: int = 0):
+        self.path = path
+        self.name = name
+        self.size = size
+        self.mtime = mtime
+        self.is_tana = is_tana
+        self.matches = matches
+
+    @property
+    def modified(self) -> datetime:
+        """Modification time as a local datetime"""
+        return datetime.fromtimestamp(self.mtime)
+
+    def __repr__(self) -> str:
+        return f"FileInfo(name={self.name!r}, size={self.size!r})"
+
+
+def _iter_chunks(f) -> Iterator[Union[bytes, str]]:
+    """Yield a file's contents in SEARCH_CHUNK_SIZE pieces"""
+    if 'b' in f.mode:
+        # Map binary files so windows are paged in by the OS rather than read()
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty files cannot be mapped
+            return
+        with mapped:
+            for start in range(0, len(mapped), SEARCH_CHUNK_SIZE):
+                yield mapped[start:start + SEARCH_CHUNK_SIZE]
+        return
+
+    while True:
+        chunk = f.read(SEARCH_CHUNK_SIZE)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _iter_lowered_bytes(f) -> Iterator[bytes]:
+    """Yield a UTF-8 file's chunks with ASCII letters lowercased as str.lower() would"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    pending = b''
+    for chunk in _iter_chunks(f):
+        if not pending and chunk.isascii():
+            yield chunk.lower()
+            continue
+        # Decoding only validates, raising UnicodeDecodeError like the text path
+        decoder.decode(chunk)
+        chunk = pending + chunk
+        # A character split across chunks is held back until it is complete
+        pending = decoder.getstate()[0]
+        chunk = chunk[:len(chunk) - len(pending)].lower()
+        for upper, lower in _ASCII_LOWERCASE_FOLDS:
+            chunk = chunk.replace(upper, lower)
+        yield chunk
+    decoder.decode(b'', final=True)
+
+
+def _count_matches(file_path: Path, keyword: str) -> int:
+    """Count case-insensitive keyword occurrences, reading the file in chunks"""
+    # An empty keyword matches nothing (the chunked count would be meaningless)
+    if not keyword:
+        return 0
+
+    # JSON structure is ASCII, so ASCII keywords can be matched on raw bytes
+    # (with the same results as on decoded text); other keywords use text chunks
+    if keyword.isascii():
+        needle, mode, encoding = keyword.lower().encode('ascii'), 'rb', None
+    else:
+        needle, mode, encoding = keyword.lower(), 'r', 'utf-8'
+
+    size = len(needle)
+    # For keywords like "aa" the last occurrence may overlap a counted one
+    self_overlapping = any(needle[:i] == needle[-i:] for i in range(1, size))
+
+    count = 0
+    carry = needle[:0]
+    with open(file_path, mode, encoding=encoding) as f:
+        if encoding is None:
+            chunks = _iter_lowered_bytes(f)
+        else:
+            chunks = (chunk.lower() for chunk in _iter_chunks(f))
+        for lowered in chunks:
+            buf = carry + lowered
+            found = buf.count(needle)
+            count += found
+            # Keep enough of the tail for a match spanning into the next chunk,
+            # but never the characters of a match already counted
+            keep_from = max(len(buf) - size + 1, 0)
+            if found:
+                if self_overlapping:
+                    # Smallest prefix still holding every match ends where the last one does
+                    low, high = size, len(buf)
+                    while low < high:
+                        mid = (low + high) // 2
+                        if buf.count(needle, 0, mid) == found:
+                            high = mid
+                        else:
+                            low = mid + 1
+                    last_end = low
+                else:
+                    last_end = buf.rfind(needle) + size
+                keep_from = max(keep_from, last_end)
+            carry = buf[keep_from:]
+    return count
+
+
+def _scan_file(file_path: Union[Path, os.DirEntry], keyword: str) -> int:
+    """Count keyword matches in one file, treating unreadable files as no match"""
+    try:
+        return _count_matches(file_path, keyword)
+    except (OSError, UnicodeDecodeError):
+        return 0
+
+
+@lru_cache(maxsize=32)
+def _compiled_pattern(pattern: str) -> Pattern[str]:
+    """Compile a glob pattern once, with fnmatch's case handling"""
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+
+def _iter_files(dir_path: Path, pattern: str = "*.json") -> Iterator[os.DirEntry]:
+    """Yield the files in a directory whose names match a glob pattern"""
+    # The default pattern is a plain suffix test, no fnmatch needed
+    if pattern == "*.json":
+        matches = lambda name: name.endswith('.json')
+    else:
+        pattern_match = _compiled_pattern(pattern).match
+        matches = lambda name: pattern_match(os.path.normcase(name))
+
+    with os.scandir(dir_path) as entries:
+        for entry in entries:
+            if matches(entry.name) and entry.is_file():
+                yield entry
+
+
+def _forget_parsed(file_path: Path) -> None:
+    """Drop cached parses of a file that is about to be rewritten"""
+    path = os.path.abspath(file_path)
+    for key in [key for key in _parse_cache if key[0] == path]:
+        del _parse_cache[key]
+
+
+def _copy_file_in_kernel(src_fd: int, dst_fd: int, size: int) -> None:
+    """Copy size bytes between descriptors with copy_file_range, which can reflink on copy-on-write filesystems"""
+    copied = 0
+    while copied < size:
+        sent = os.copy_file_range(src_fd, dst_fd, size - copied)
+        if sent == 0:
+            break
+        copied += sent
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy a file with its metadata like shutil.copy2, using kernel copies where possible"""
+    copied = False
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                _copy_file_in_kernel(fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno()).st_size)
+            copied = True
+        except OSError:
+            pass
+    if not copied:
+        # shutil uses the platform's own fast path (sendfile, fcopyfile) where there is one
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
 
 class TanaIO:
     """Handle Tana file input/output operations"""
@@ -20,41 +219,91 @@ class TanaIO:
     def __init__(self, files_dir: Optional[Path] = None):
         """Initialize with custom files directory"""
         self.files_dir = files_dir or DEFAULT_FILES_DIR
-        self.export_dir = self.files_dir / "export"  # For markdown exports
-        self.import_dir = self.files_dir / "import"  # For Tana JSON imports
 
-        # Ensure directories exist
-        for dir_path in [self.files_dir, self.export_dir, self.import_dir]:
-            dir_path.mkdir(parents=True, exist_ok=True)
+    # Directories are created on first access rather than on every construction
+
+    @cached_property
+    def export_dir(self) -> Path:
+        """Directory for markdown exports"""
+        path = self.files_dir / "export"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @cached_property
+    def import_dir(self) -> Path:
+        """Directory for Tana JSON imports"""
+        path = self.files_dir / "import"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @cached_property
+    def _backups_dir(self) -> Path:
+        """Default directory for file backups"""
+        path = self.files_dir / "backups"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
 
     def find_latest_import(self, pattern: str = "*.json") -> Path:
         """Find the most recent Tana import file"""
-        imports = list(self.import_dir.glob(pattern))
+        latest = None
+        latest_mtime = None
+
+        # Track the newest entry while scanning instead of collecting and re-statting
+        for entry in _iter_files(self.import_dir, pattern):
+            mtime = entry.stat().st_mtime
+            if latest_mtime is None or mtime > latest_mtime:
+                latest, latest_mtime = entry.path, mtime
 
-        if not imports:
+        if latest is None:
             Colors.error(f"No Tana import files found in {self.import_dir}")
 
-        latest = max(imports, key=lambda f: f.stat().st_mtime)
-        return latest
+        return Path(latest)
 
-    def load_tana_file(self, file_path: Path) -> Dict[str, Any]:
-        """Load a Tana JSON file"""
-        if not file_path.exists():
-            Colors.error(f"Tana file not found: {file_path}")
+    def load_tana_file(self, file_path: Path, cached: bool = False) -> Dict[str, Any]:
+        """Load a Tana JSON file
 
+        With cached=True an unchanged file is served from a small parse cache and
+        the data is shared with other cached callers, so only read-only callers
+        should opt in.
+        """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with open(file_path, 'rb') as f:
+                if not cached:
+                    return json_backend.loads(f.read())
+
+                # Stat the open file so the key matches the bytes we would read
+                stat = os.fstat(f.fileno())
+                key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+                data = _parse_cache.get(key)
+                if data is None:
+                    data = json_backend.loads(f.read())
+                    _parse_cache[key] = data
+                    if len(_parse_cache) > _PARSE_CACHE_SIZE:
+                        _parse_cache.popitem(last=False)
+                else:
+                    _parse_cache.move_to_end(key)
+                return data
+        except FileNotFoundError:
+            Colors.error(f"Tana file not found: {file_path}")
         except json.JSONDecodeError as e:
             Colors.error(f"Invalid JSON in file {file_path}: {e}")
         except Exception as e:
             Colors.error(f"Error reading file {file_path}: {e}")
 
+    def load_and_validate(self, file_path: Path, cached: bool = False) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Load a Tana JSON file with a single read and check its structure"""
+        # With ijson the top-level keys are streamed first, so a file that isn't
+        # Tana JSON is never parsed in full; without it the loaded data is checked
+        if json_backend.HAS_IJSON and not self.validate_tana_file(file_path):
+            return None, False
+        data = self.load_tana_file(file_path, cached=cached)
+        return data, self.validate_tana_structure(data)
+
     def save_tana_file(self, data: Dict[str, Any], file_path: Path) -> None:
         """Save data to a Tana JSON file"""
+        _forget_parsed(file_path)
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            json_backend.dump_path(file_path, data, indent=True)
         except Exception as e:
             Colors.error(f"Error saving file {file_path}: {e}")
 
@@ -73,61 +322,82 @@ class TanaIO:
 
         return False
 
-    def get_file_info(self, file_path: Path) -> Dict[str, Any]:
-        """Get file information"""
-        stat = file_path.stat()
-        return {
-            'path': str(file_path),
-            'name': file_path.name,
-            'size': stat.st_size,
-            'modified': datetime.fromtimestamp(stat.st_mtime),
-            'is_tana': file_path.suffix.lower() == '.json'
-        }
-
-    def list_files(self, directory: Optional[Path] = None, pattern: str = "*.json") -> List[Dict[str, Any]]:
-        """List files in directory with info"""
-        dir_path = directory or self.import_dir
-        files = []
+    def validate_tana_file(self, file_path: Path) -> bool:
+        """Check a file's top-level keys for a Tana structure without loading it"""
+        keys = set()
+        try:
+            # Stops reading as soon as the required keys have been seen
+            for key in json_backend.iter_top_level_keys(file_path):
+                keys.add(key)
+                if 'docs' in keys or ('version' in keys and 'nodes' in keys):
+                    return True
+        except (OSError, ValueError):  # includes JSON and UTF-8 decode errors
+            return False
+        return False
 
-        for file_path in dir_path.glob(pattern):
-            files.append(self.get_file_info(file_path))
+    def get_file_info(self, file_path: Union[Path, os.DirEntry],
+                      stat_result: Optional[os.stat_result] = None) -> FileInfo:
+        """Get file information, reusing a stat result or DirEntry's cached stat when given"""
+        if stat_result is None:
+            stat_result = file_path.stat()
+        path = os.fspath(file_path)
+        name = os.path.basename(path)
+        return FileInfo(path, name, stat_result.st_size, stat_result.st_mtime,
+                        os.path.splitext(name)[1].lower() == '.json')
 
-        return sorted(files, key=lambda x: x['modified'], reverse=True)
+    def list_files(self, directory: Optional[Path] = None, pattern: str = "*.json") -> List[FileInfo]:
+        """List files in directory with info"""
+        dir_path = directory or self.import_dir
+        files = [self.get_file_info(entry, entry.stat()) for entry in _iter_files(dir_path, pattern)]
+        files.sort(key=lambda info: info.mtime, reverse=True)
+        return files
 
-    def search_files(self, keyword: str, directories: Optional[List[Path]] = None) -> List[Dict[str, Any]]:
+    def search_files(self, keyword: str, directories: Optional[List[Path]] = None) -> List[FileInfo]:
         """Search for files containing keyword"""
+        if not keyword:
+            return []
+
         dirs = directories or [self.import_dir]
-        matches = []
+        candidates = []
+        # Files smaller than an ASCII keyword cannot contain it, so they are never opened
+        min_size = len(keyword) if keyword.isascii() else 1
 
         for dir_path in dirs:
             if not dir_path.exists():
                 continue
 
-            for file_path in dir_path.glob("*.json"):
+            for entry in _iter_files(dir_path):
                 try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if keyword.lower() in content.lower():
-                            file_info = self.get_file_info(file_path)
-                            file_info['matches'] = content.lower().count(keyword.lower())
-                            matches.append(file_info)
-                except:
+                    size = entry.stat().st_size
+                except OSError:
                     continue
+                if size >= min_size:
+                    candidates.append(entry)
 
-        return sorted(matches, key=lambda x: x['matches'], reverse=True)
+        # Reads and counting release the GIL, so files are scanned in parallel
+        with ThreadPoolExecutor(max_workers=_SEARCH_WORKERS) as pool:
+            counts = list(pool.map(lambda entry: _scan_file(entry, keyword), candidates))
+
+        matches = []
+        for entry, count in zip(candidates, counts):
+            if count:
+                file_info = self.get_file_info(entry)
+                file_info.matches = count
+                matches.append(file_info)
+
+        return sorted(matches, key=lambda info: info.matches, reverse=True)
 
     def backup_file(self, file_path: Path, backup_dir: Optional[Path] = None) -> Path:
         """Create a backup of a file"""
         if backup_dir is None:
-            backup_dir = self.files_dir / "backups"
-
-        backup_dir.mkdir(parents=True, exist_ok=True)
+            backup_dir = self._backups_dir
+        else:
+            backup_dir.mkdir(parents=True, exist_ok=True)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_name = f"{file_path.stem}_{timestamp}{file_path.suffix}"
         backup_path = backup_dir / backup_name
 
-        import shutil
-        shutil.copy2(file_path, backup_path)
+        _copy_file(file_path, backup_path)
 
         return backup_path
\ No newline at end of file
@@ -5,14 +5,32 @@ This module extends the TanaImporter to parse actual Tana JSON exports
 and extract supertag and node information dynamically.
 """
 
-import json
+import os
+import re
+import shutil
+import time
+from collections import Counter, defaultdict
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
 
 from .colors import Colors
+from . import json_backend
 from .keytags_manager import KeyTagsManager
 
+# Marks a finished child iterator on the traversal stack
+_EXHAUSTED = object()
+
+# Start of a line that ends a markdown section: a "##" heading or a blank line
+_SECTION_END_RE = re.compile(r'^[^\S\n]*(?:##|$)', re.MULTILINE)
+
+
+@lru_cache(maxsize=8192)
+def _format_epoch_ms(timestamp: float) -> str:
+    """ISO format a millisecond Unix timestamp; exports repeat these heavily"""
+    return datetime.fromtimestamp(timestamp / 1000).isoformat()
+
 
 class TanaJSONParser:
     """Enhanced Tana JSON parsing capabilities"""
@@ -27,23 +45,54 @@ class TanaJSONParser:
         # Cache parsed data
         self._cached_data = None
         self._cache_timestamp = None
+        self._cache_source_stat = None  # (path, mtime_ns, size) of the parsed export
+
+        # list_nodes_by_supertag result order per (supertags, sort_by, reverse)
+        self._sorted_ids: Dict[Tuple, List[str]] = {}
+        self._sorted_ids_data = None
+
+        # is_supertag results by node identity, only kept while a parse runs
+        self._is_supertag_cache: Optional[Dict[int, bool]] = None
 
     def get_fresh_data(self, force_refresh: bool = False, cache_ttl: int = 60) -> Dict[str, Any]:
         """Get fresh or cached Tana JSON data with dynamic supertag awareness"""
-        now = datetime.now()
-
-        # Check if cache is valid (shorter TTL for dynamic data)
-        if (not force_refresh and
-            self._cached_data and
-            self._cache_timestamp and
-            (now - self._cache_timestamp).seconds < cache_ttl):
-            return self._cached_data
+        # Monotonic seconds: cheap to read and unaffected by clock changes
+        now = time.monotonic()
+        source_stat = self.export_file_stat()
+
+        if not force_refresh and self._cached_data:
+            if source_stat is not None:
+                # Cache stays valid until the export file itself changes
+                if source_stat == self._cache_source_stat:
+                    return self._cached_data
+            elif (self._cache_timestamp is not None and
+                  now - self._cache_timestamp < cache_ttl):
+                # No export file to watch, fall back to the TTL
+                return self._cached_data
 
         # Parse fresh data
-        self._cached_data = self.parse_tana_json()
+        self._cached_data = self.parse_tana_json(source_stat[0] if source_stat else None)
         self._cache_timestamp = now
+        self._cache_source_stat = source_stat
         return self._cached_data
 
+    def export_file_stat(self) -> Optional[Tuple[str, int, int]]:
+        """Locate the Tana JSON export and return (path, mtime_ns, size), or None"""
+        possible_files = [
+            self.export_dir / "tana-export.json",
+            self.export_dir / "export.json",
+            self.files_dir / "tana-export.json"
+        ]
+
+        for possible_file in possible_files:
+            try:
+                stat = possible_file.stat()
+            except OSError:
+                continue
+            return str(possible_file), stat.st_mtime_ns, stat.st_size
+
+        return None
+
     def check_for_changes(self, previous_data: Dict = None) -> Dict[str, Any]:
         """Check if supertags or nodes have changed since last parse"""
         current_data = self.get_fresh_data(force_refresh=True)
@@ -66,42 +115,44 @@ class TanaJSONParser:
             "usage_changes": []
         }
 
-        # Check for added supertags
-        for node_id, supertag in current_supertags.items():
-            if node_id not in previous_supertags:
-                changes["added"].append(supertag)
+        # One pass over current supertags covers added, modified and usage changes
+        add_added = changes["added"].append
+        add_modified = changes["modified"].append
+        add_usage_change = changes["usage_changes"].append
+        for node_id, current_supertag in current_supertags.items():
+            previous = previous_supertags.get(node_id)
+            if previous is None:
+                add_added(current_supertag)
+                continue
+
+            # Check for meaningful changes (excluding usage count)
+            name = current_supertag["name"]
+            if (name != previous["name"] or
+                current_supertag.get("description") != previous.get("description") or
+                len(current_supertag.get("fields", [])) != len(previous.get("fields", []))):
+                add_modified({
+                    "node_id": node_id,
+                    "previous": previous,
+                    "current": current_supertag
+                })
 
-        # Check for removed supertags
-        for node_id, supertag in previous_supertags.items():
-            if node_id not in current_supertags:
-                changes["removed"].append(supertag)
+            # Track usage count changes separately
+            current_usage = current_supertag.get("usage_count", 0)
+            previous_usage = previous.get("usage_count", 0)
+            if current_usage != previous_usage:
+                add_usage_change({
+                    "node_id": node_id,
+                    "name": name,
+                    "previous_usage": previous_usage,
+                    "current_usage": current_usage
+                })
 
-        # Check for modified supertags
-        for node_id, current_supertag in current_supertags.items():
-            if node_id in previous_supertags:
-                previous = previous_supertags[node_id]
-
-                # Check for meaningful changes (excluding usage count)
-                if (current_supertag["name"] != previous["name"] or
-                    current_supertag.get("description") != previous.get("description") or
-                    len(current_supertag.get("fields", [])) != len(previous.get("fields", []))):
-                    changes["modified"].append({
-                        "node_id": node_id,
-                        "previous": previous,
-                        "current": current_supertag
-                    })
-
-                # Track usage count changes separately
-                if (current_supertag.get("usage_count", 0) !=
-                    previous.get("usage_count", 0)):
-                    changes["usage_changes"].append({
-                        "node_id": node_id,
-                        "name": current_supertag["name"],
-                        "previous_usage": previous.get("usage_count", 0),
-                        "current_usage": current_supertag.get("usage_count", 0)
-                    })
-
-        has_changes = bool(any(changes[key] for key in ["added", "removed", "modified"]))
+        changes["removed"] = [
+            supertag for node_id, supertag in previous_supertags.items()
+            if node_id not in current_supertags
+        ]
+
+        has_changes = bool(changes["added"] or changes["removed"] or changes["modified"])
 
         return {
             "has_changes": has_changes,
@@ -115,39 +166,31 @@ class TanaJSONParser:
         """Parse Tana JSON export file and return structured data"""
         if not file_path:
             # Look for Tana JSON export file
-            possible_files = [
-                self.export_dir / "tana-export.json",
-                self.export_dir / "export.json",
-                self.files_dir / "tana-export.json"
-            ]
-
-            file_path = None
-            for possible_file in possible_files:
-                if possible_file.exists():
-                    file_path = str(possible_file)
-                    break
-
-            if not file_path:
+            source_stat = self.export_file_stat()
+            if not source_stat:
                 return {
                     "supertags": [],
                     "nodes": [],
                     "raw_data": {},
                     "error": "No Tana JSON export file found"
                 }
+            file_path = source_stat[0]
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                tana_data = json.load(f)
-
-            # Extract supertags
-            supertags = self.extract_supertags_from_json(tana_data)
+            tana_data = json_backend.load_path(file_path)
 
-            # Create node index
-            node_index = self.create_node_index(tana_data)
+            # Extract supertags and create node index in one walk
+            self._is_supertag_cache = {}
+            try:
+                supertags, node_index, duplicate_uids = self.index_tana_data(tana_data)
+            finally:
+                self._is_supertag_cache = None
 
             return {
                 "supertags": supertags,
                 "nodes": node_index,
+                "duplicate_uids": duplicate_uids,
+                "supertag_index": self.build_supertag_index(node_index),
                 "raw_data": tana_data,
                 "source_file": file_path,
                 "parsed_at": datetime.now().isoformat()
@@ -162,80 +205,120 @@ class TanaJSONParser:
                 "error": str(e)
             }
 
-    def extract_supertags_from_json(self, tana_data: Dict) -> List[Dict]:
-        """Extract all supertags from Tana JSON"""
-        supertags = []
+    def index_tana_data(self, tana_data: Dict) -> Tuple[List[Dict], Dict[str, Dict], Set[str]]:
+        """Extract supertags, the node index and repeated uids in a single traversal"""
+        supertag_nodes = []
+        node_index = {}
+        duplicate_uids = set()
+        usage = Counter()
 
-        # Look for nodes with supertag definitions
-        for node in self.traverse_nodes(tana_data):
-            if self.is_supertag(node):
-                supertag_info = {
-                    "name": node.get("name", ""),
-                    "node_id": node.get("uid", ""),
-                    "description": self.extract_description(node),
-                    "fields": self.extract_fields(node),
-                    "usage_count": self.count_supertag_usage(node.get("uid", ""), tana_data),
-                    "created": self.format_timestamp(node.get("created")),
-                    "node_data": node
-                }
-                supertags.append(supertag_info)
+        # Bound once for the per-node loop
+        extract_node_supertags = self.extract_node_supertags
+        is_supertag = self.is_supertag
+        extract_content = self.extract_content
+        format_timestamp = self.format_timestamp
+        extract_parent_id = self.extract_parent_id
 
-        return supertags
+        for node in self.traverse_nodes(tana_data):
+            node_supertags = extract_node_supertags(node)
+            # Tally usage here rather than rescanning the tree per supertag
+            usage.update(node_supertags)
 
-    def create_node_index(self, tana_data: Dict) -> Dict[str, Dict]:
-        """Create an index of all nodes for quick lookup"""
-        node_index = {}
+            if is_supertag(node):
+                supertag_nodes.append(node)
 
-        for node in self.traverse_nodes(tana_data):
             node_id = node.get("uid", "")
             if node_id:
+                if node_id in node_index:
+                    duplicate_uids.add(node_id)
                 node_index[node_id] = {
                     "name": node.get("name", ""),
-                    "content": self.extract_content(node),
-                    "supertags": self.extract_node_supertags(node),
-                    "created": self.format_timestamp(node.get("created")),
-                    "modified": self.format_timestamp(node.get("edited")),
-                    "parent_id": self.extract_parent_id(node),
+                    "content": extract_content(node),
+                    "supertags": node_supertags,
+                    "created": format_timestamp(node.get("created")),
+                    "modified": format_timestamp(node.get("edited")),
+                    "parent_id": extract_parent_id(node),
                     "children": node.get("children", []),
                     "raw_data": node
                 }
 
-        return node_index
+        supertags = []
+        for node in supertag_nodes:
+            node_id = node.get("uid", "")
+            supertags.append({
+                "name": node.get("name", ""),
+                "node_id": node_id,
+                "description": self.extract_description(node),
+                "fields": self.extract_fields(node),
+                "usage_count": usage[node_id],
+                "created": format_timestamp(node.get("created")),
+                "node_data": node
+            })
+
+        return supertags, node_index, duplicate_uids
+
+    def build_supertag_index(self, node_index: Dict[str, Dict]) -> Dict[str, List[str]]:
+        """Map each supertag id to the ids of the nodes using it, in node index order"""
+        supertag_index = defaultdict(list)
+        for node_id, node_info in node_index.items():
+            for supertag_id in node_info["supertags"]:
+                supertag_index[supertag_id].append(node_id)
+        return dict(supertag_index)
 
-    def traverse_nodes(self, tana_data: Dict, nodes: List = None) -> List[Dict]:
-        """Recursively traverse all nodes in Tana JSON"""
-        if nodes is None:
-            nodes = []
+    def extract_supertags_from_json(self, tana_data: Dict) -> List[Dict]:
+        """Extract all supertags from Tana JSON"""
+        return self.index_tana_data(tana_data)[0]
 
+    def create_node_index(self, tana_data: Dict) -> Dict[str, Dict]:
+        """Create an index of all nodes for quick lookup"""
+        return self.index_tana_data(tana_data)[1]
+
+    def traverse_nodes(self, tana_data: Dict) -> Iterator[Dict]:
+        """Yield all nodes in Tana JSON depth-first, parents before their children"""
         # Handle different Tana export formats
         if "nodes" in tana_data:
             # Format with explicit nodes array
-            for node in tana_data["nodes"]:
-                nodes.append(node)
-                if "children" in node:
-                    self.traverse_nodes({"nodes": node["children"]}, nodes)
+            roots = tana_data["nodes"]
         elif isinstance(tana_data, list):
             # Format with direct array of nodes
-            for node in tana_data:
-                nodes.append(node)
-                if "children" in node:
-                    self.traverse_nodes(node["children"], nodes)
+            roots = tana_data
         else:
             # Single node format
-            nodes.append(tana_data)
-            if "children" in tana_data:
-                self.traverse_nodes(tana_data["children"], nodes)
+            roots = (tana_data,)
+
+        # Explicit stack of child iterators instead of recursion
+        stack = [iter(roots)]
+        while stack:
+            node = next(stack[-1], _EXHAUSTED)
+            if node is _EXHAUSTED:
+                stack.pop()
+                continue
 
-        return nodes
+            yield node
+            children = node.get("children") if isinstance(node, dict) else None
+            if isinstance(children, list):
+                stack.append(iter(children))
 
     def is_supertag(self, node: Dict) -> bool:
         """Check if a node is a supertag"""
-        # Look for supertag indicators
+        cache = self._is_supertag_cache
+        if cache is None:
+            return self._has_supertag_indicators(node)
+
+        # Nodes are revisited by extract_content for every ancestor
+        key = id(node)
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = self._has_supertag_indicators(node)
+        return result
+
+    def _has_supertag_indicators(self, node: Dict) -> bool:
+        """Look for supertag indicators, cheapest checks first"""
         return (
             node.get("type") == "supertag" or
+            node.get("uid", "").startswith("supertag_") or
             "supertag" in node.get("name", "").lower() or
-            any(field.get("type") == "supertag" for field in node.get("fields", [])) or
-            node.get("uid", "").startswith("supertag_")
+            any(field.get("type") == "supertag" for field in node.get("fields", []))
         )
 
     def extract_description(self, node: Dict) -> str:
@@ -272,18 +355,46 @@ class TanaJSONParser:
         return fields
 
     def extract_content(self, node: Dict) -> str:
-        """Extract text content from node"""
+        """Extract text content from node and its non-supertag descendants"""
         content_parts = []
 
         if "content" in node:
             content_parts.append(node["content"])
 
-        if "children" in node:
-            for child in node["children"]:
-                if not self.is_supertag(child):
-                    child_content = self.extract_content(child)
-                    if child_content:
-                        content_parts.append(child_content)
+        if "children" not in node:
+            return "\n".join(content_parts)
+
+        # Iterative pre-order walk. An empty descendant content still adds a
+        # line break when something below it has content, so empty entries
+        # wait in pending (by depth) until a non-empty part shows up.
+        pending = []
+        stack = [iter(node["children"])]
+        while stack:
+            child = next(stack[-1], _EXHAUSTED)
+            if child is _EXHAUSTED:
+                stack.pop()
+                depth = len(stack)
+                while pending and pending[-1] >= depth:
+                    pending.pop()
+                continue
+
+            if self.is_supertag(child):
+                continue
+
+            depth = len(stack)
+            if "content" in child:
+                child_content = child["content"]
+                if child_content == "":
+                    pending.append(depth)
+                else:
+                    content_parts.extend([""] * len(pending))
+                    pending.clear()
+                    content_parts.append(child_content)
+
+            if "children" in child:
+                stack.append(iter(child["children"]))
+            elif pending and pending[-1] == depth:
+                pending.pop()
 
         return "\n".join(content_parts)
 
@@ -297,7 +408,7 @@ class TanaJSONParser:
         if "tags" in node:
             supertags.extend(node["tags"])
 
-        return list(set(supertags))  # Remove duplicates
+        return list(dict.fromkeys(supertags))  # Remove duplicates, keeping order
 
     def extract_parent_id(self, node: Dict) -> Optional[str]:
         """Extract parent node ID"""
@@ -324,7 +435,7 @@ class TanaJSONParser:
 
         if isinstance(timestamp, (int, float)):
             # Handle Unix timestamp (milliseconds)
-            return datetime.fromtimestamp(timestamp / 1000).isoformat()
+            return _format_epoch_ms(timestamp)
 
         return str(timestamp)
 
@@ -371,24 +482,46 @@ class TanaJSONParser:
             # TODO: Implement inheritance resolution from keytags
             pass
 
-        # Filter nodes by supertag
+        sort_by = options.get("sort_by", "name")
+        reverse = options.get("order", "desc").lower() == "desc"
+
+        # Sorted node order is remembered per query until the data is re-parsed
+        if self._sorted_ids_data is not data:
+            self._sorted_ids_data = data
+            self._sorted_ids = {}
+        order_key = (tuple(target_supertags), sort_by, reverse)
+        node_ids = self._sorted_ids.get(order_key)
+        presorted = node_ids is not None
+
+        if not presorted:
+            # Look up nodes by supertag instead of scanning every node
+            supertag_index = data.get("supertag_index", {})
+            if len(target_supertags) == 1:
+                node_ids = supertag_index.get(supertag_id, [])
+            else:
+                wanted = set()
+                for target in target_supertags:
+                    wanted.update(supertag_index.get(target, []))
+                node_ids = [node_id for node_id in nodes if node_id in wanted]
+
         matching_nodes = []
-        for node_id, node_info in nodes.items():
-            node_supertags = set(node_info.get("supertags", []))
-            if any(supertag in node_supertags for supertag in target_supertags):
-                matching_nodes.append({
-                    "node_id": node_id,
-                    "name": node_info["name"],
-                    "content_preview": (node_info["content"][:100] + "...") if len(node_info["content"]) > 100 else node_info["content"],
-                    "created": node_info["created"],
-                    "modified": node_info["modified"],
-                    "supertags": node_info["supertags"]
-                })
+        add_match = matching_nodes.append
+        for node_id in node_ids:
+            node_info = nodes[node_id]
+            content = node_info["content"]
+            add_match({
+                "node_id": node_id,
+                "name": node_info["name"],
+                "content_preview": (content[:100] + "...") if len(content) > 100 else content,
+                "created": node_info["created"],
+                "modified": node_info["modified"],
+                "supertags": node_info["supertags"]
+            })
 
         # Sort results
-        sort_by = options.get("sort_by", "name")
-        reverse = options.get("order", "desc").lower() == "desc"
-        matching_nodes.sort(key=lambda x: x.get(sort_by, ""), reverse=reverse)
+        if not presorted:
+            matching_nodes.sort(key=lambda x: x.get(sort_by, ""), reverse=reverse)
+            self._sorted_ids[order_key] = [node["node_id"] for node in matching_nodes]
 
         return {
             "success": True,
@@ -441,8 +574,7 @@ class TanaJSONParser:
         # Supertags
         if node_info.get("supertags"):
             content_parts.append("## 🏷️ Supertags")
-            for supertag in node_info["supertags"]:
-                content_parts.append(f"- {supertag}")
+            content_parts.extend(f"- {supertag}" for supertag in node_info["supertags"])
             content_parts.append("")
 
         # Content
@@ -486,8 +618,8 @@ class TanaJSONParser:
             options = {}
 
         try:
-            # Get fresh data
-            data = self.get_fresh_data(force_refresh=True)
+            # Cached data is re-parsed whenever the export file changed
+            data = self.get_fresh_data()
             raw_data = data.get("raw_data", {})
 
             if not raw_data:
@@ -496,8 +628,13 @@ class TanaJSONParser:
                     "error": "No Tana JSON data available"
                 }
 
-            # Find the node
-            node_data = self.find_node_by_id(node_id, raw_data)
+            # Find the node through the index instead of walking raw_data
+            node_info = data.get("nodes", {}).get(node_id)
+            node_data = node_info["raw_data"] if node_info else None
+            if node_data and node_id in data.get("duplicate_uids", ()):
+                # The index keeps the last node with a uid; edits go to the first one
+                node_data = next(node for node in self.traverse_nodes(raw_data)
+                                 if node.get("uid") == node_id)
             if not node_data:
                 return {
                     "success": False,
@@ -520,26 +657,22 @@ class TanaJSONParser:
             # Convert node to JSON structure for modification
             modified_node = self.modify_node_content(node_data, content, position, section)
 
-            # Update the node in the JSON structure
-            update_result = self.update_node_in_json(node_id, modified_node, raw_data)
-            if not update_result["success"]:
-                return {
-                    "success": False,
-                    "error": f"Failed to update node: {update_result['error']}"
-                }
+            # Update the node in place; it is the same object raw_data holds
+            node_data.update(modified_node)
 
             # Save the modified JSON
-            save_result = self.save_modified_json(raw_data, data.get("source_file"))
+            try:
+                save_result = self.save_modified_json(raw_data, data.get("source_file"))
+            finally:
+                # The cached tree holds the edit now, so drop it even if the save failed
+                self._cached_data = None
+                self._cache_timestamp = None
             if not save_result["success"]:
                 return {
                     "success": False,
                     "error": f"Failed to save changes: {save_result['error']}"
                 }
 
-            # Clear cache to force refresh
-            self._cached_data = None
-            self._cache_timestamp = None
-
             # Return success with metadata
             return {
                 "success": True,
@@ -598,7 +731,8 @@ original_uid: {node_data.get('uid', 'unknown')}
 
             # Write backup file
             with open(backup_path, 'w', encoding='utf-8') as f:
-                f.write(backup_header + markdown_content)
+                f.write(backup_header)
+                f.write(markdown_content)
 
             return {
                 "success": True,
@@ -614,10 +748,8 @@ original_uid: {node_data.get('uid', 'unknown')}
 
     def modify_node_content(self, node_data: Dict, content: str, position: str, section: str = None) -> Dict:
         """Modify node content by appending new content"""
-        import copy
-
-        # Create a deep copy to avoid modifying original
-        modified_node = copy.deepcopy(node_data)
+        # Shallow copy: only top-level keys change, children are shared untouched
+        modified_node = dict(node_data)
 
         # Extract current content
         current_content = self.extract_content(node_data)
@@ -654,35 +786,49 @@ original_uid: {node_data.get('uid', 'unknown')}
 
     def insert_before_section(self, content: str, section: str, new_content: str) -> str:
         """Insert content before a specific section"""
-        lines = content.split('\n')
-        section_pattern = f"## {section}"  # Assuming markdown sections
-
-        for i, line in enumerate(lines):
-            if line.strip() == section_pattern or section.lower() in line.lower():
-                # Insert before this line
-                lines.insert(i, f"\n{new_content}")
-                break
+        line_start = self._find_section_line(content, section)
+        if line_start is None:
+            return content
 
-        return '\n'.join(lines)
+        # Insert before this line
+        return f"{content[:line_start]}\n{new_content}\n{content[line_start:]}"
 
     def insert_after_section(self, content: str, section: str, new_content: str) -> str:
         """Insert content after a specific section"""
-        lines = content.split('\n')
-        section_pattern = f"## {section}"
+        line_start = self._find_section_line(content, section)
+        if line_start is None:
+            return content
 
-        for i, line in enumerate(lines):
+        # Find the end of this section (next ## line, blank line or end of content)
+        line_end = content.find("\n", line_start)
+        end = _SECTION_END_RE.search(content, line_end + 1) if line_end >= 0 else None
+        if end is None:
+            return f"{content}\n\n{new_content}"
+
+        insert_at = end.start()
+        return f"{content[:insert_at]}\n{new_content}\n{content[insert_at:]}"
+
+    def _find_section_line(self, content: str, section: str) -> Optional[int]:
+        """Offset of the first line that mentions section (case-insensitive), or None"""
+        if "\n" in section:
+            return None  # no single line can contain it
+
+        lowered = content.lower()
+        if len(lowered) == len(content):
+            # One scan over the whole text instead of splitting it into lines
+            index = lowered.find(section.lower())
+            if index < 0:
+                return None
+            return content.rfind("\n", 0, index) + 1
+
+        # lower() changed the length, so offsets differ; check line by line
+        section_pattern = f"## {section}"  # Assuming markdown sections
+        offset = 0
+        for line in content.split('\n'):
             if line.strip() == section_pattern or section.lower() in line.lower():
-                # Find the end of this section (next ## or end of content)
-                insert_pos = i + 1
-                while (insert_pos < len(lines) and
-                       not lines[insert_pos].strip().startswith("##") and
-                       lines[insert_pos].strip()):
-                    insert_pos += 1
-
-                lines.insert(insert_pos, f"\n{new_content}")
-                break
-
-        return '\n'.join(lines)
+                return offset
+            offset += len(line) + 1
+        return None
 
     def update_node_in_json(self, node_id: str, modified_node: Dict, json_data: Dict) -> Dict:
         """Update a node in the JSON structure"""
@@ -730,12 +876,15 @@ original_uid: {node_data.get('uid', 'unknown')}
             backup_path = original_path.with_suffix(f".backup_{int(datetime.now().timestamp())}.json")
 
             if original_path.exists():
-                import shutil
-                shutil.copy2(original_path, backup_path)
-
-            # Write modified JSON
-            with open(source_file, 'w', encoding='utf-8') as f:
-                json.dump(json_data, f, indent=2, ensure_ascii=False)
+                # A hard link keeps the old contents without copying them; the
+                # rewrite below goes to a new inode, so the link stays intact
+                try:
+                    os.link(original_path, backup_path)
+                except OSError:
+                    shutil.copy2(original_path, backup_path)
+
+            # Write modified JSON to a unique temp file and swap it in atomically
+            json_backend.dump_path(original_path, json_data, indent=True)
 
             return {
                 "success": True,
@@ -5,9 +5,29 @@ This module provides utilities for parsing and analyzing Tana JSON export files.
 """
 
 import json
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from collections import defaultdict
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick is an optional speedup for search_many
+    ahocorasick = None
+
+# Search index row columns each search type looks at
+_SEARCH_COLUMNS = {'name': (1,), 'description': (2,), 'all': (1, 2, 3)}
+
+@lru_cache(maxsize=4096)
+def _format_created(created) -> str:
+    """ISO format a 'created' prop given in seconds, milliseconds or ISO text"""
+    if isinstance(created, (int, float)):
+        created_dt = datetime.fromtimestamp(created / 1000 if created > 1e10 else created)
+    else:
+        created_dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
+    return created_dt.isoformat()
 
 
 class TanaParser:
@@ -18,6 +38,9 @@ class TanaParser:
     and metadata from Tana JSON exports.
     """
 
+    __slots__ = ('data', 'docs', 'nodes_index', '_children', '_root_nodes', '_by_type',
+                 '_descendant_count', '_subtree_depth', '_search_index')
+
     def __init__(self, json_data: Dict):
         """
         Initialize the parser with JSON data.
@@ -27,24 +50,53 @@ class TanaParser:
         """
         self.data = json_data
         self.docs = {doc['id']: doc for doc in self.data.get('docs', [])}
+        self._children: Mapping[Optional[str], Tuple[str, ...]] = MappingProxyType({})
+        self._root_nodes = []
+        self._by_type = defaultdict(list)
         self.nodes_index = self._build_nodes_index()
-        self.children_cache = {}
+        self._descendant_count = {}
+        self._subtree_depth = {}
+        self._search_index = None
 
     def _build_nodes_index(self) -> Dict[str, Dict]:
         """
         Build a comprehensive index of all nodes for fast lookup.
 
+        Also builds the frozen parent -> sorted children map, the root node
+        list and the node type index so that queries don't rescan every document.
+
         Returns:
             Dictionary mapping node IDs to their data
         """
         index = {}
+        children_by_parent = defaultdict(list)
+        root_nodes = self._root_nodes
+        by_type = self._by_type
         for doc_id, doc in self.docs.items():
+            parent_id = doc.get('parentId')
+            props = doc.get('props', {})
             index[doc_id] = {
                 'id': doc_id,
-                'props': doc.get('props', {}),
-                'parentId': doc.get('parentId'),
+                'props': props,
+                'parentId': parent_id,
                 'children': []
             }
+            children_by_parent[parent_id].append(doc_id)
+            by_type[props.get('_docType')].append(doc_id)
+            if not parent_id and not self.is_system_node(doc_id):
+                root_nodes.append(doc_id)
+
+        # Sort each child list by creation time once and freeze it
+        def sort_key(child_id):
+            return index[child_id]['props'].get('created') or 0
+
+        children = {}
+        for parent_id, child_ids in children_by_parent.items():
+            try:
+                children[parent_id] = tuple(sorted(child_ids, key=sort_key))
+            except TypeError:  # Mixed timestamp types; keep document order
+                children[parent_id] = tuple(child_ids)
+        self._children = MappingProxyType(children)
         return index
 
     def get_node(self, node_id: str) -> Optional[Dict]:
@@ -89,7 +141,7 @@ class TanaParser:
             return node['props'].get('_docType', 'unknown')
         return 'unknown'
 
-    def get_children(self, node_id: str) -> List[str]:
+    def get_children(self, node_id: str) -> Tuple[str, ...]:
         """
         Get direct children of a node.
 
@@ -97,27 +149,9 @@ class TanaParser:
             node_id: ID of the parent node
 
         Returns:
-            List of child node IDs
+            Tuple of child node IDs sorted by creation time
         """
-        if node_id in self.children_cache:
-            return self.children_cache[node_id]
-
-        children = []
-        for doc_id, doc in self.docs.items():
-            if doc.get('parentId') == node_id:
-                children.append(doc_id)
-
-        # Sort by creation time if available
-        def sort_key(child_id):
-            child = self.get_node(child_id)
-            if child:
-                created = child['props'].get('created', 0)
-                return created if created else 0
-            return 0
-
-        children.sort(key=sort_key)
-        self.children_cache[node_id] = children
-        return children
+        return self._children.get(node_id, ())
 
     def get_parent(self, node_id: str) -> Optional[str]:
         """
@@ -144,14 +178,19 @@ class TanaParser:
         Returns:
             List of node IDs from root to target
         """
+        nodes_index = self.nodes_index
         path = []
+        seen = set()
         current = node_id
 
-        while current and current not in path:  # Prevent infinite loops
+        while current and current not in seen:  # Prevent infinite loops
+            seen.add(current)
             path.append(current)
-            current = self.get_parent(current)
+            node = nodes_index.get(current)
+            current = node['parentId'] if node else None
 
-        return list(reversed(path))
+        path.reverse()
+        return path
 
     def get_path_names(self, node_id: str) -> List[str]:
         """
@@ -163,8 +202,13 @@ class TanaParser:
         Returns:
             List of node names from root to target
         """
-        path_ids = self.get_path(node_id)
-        return [self.get_node_name(node_id) for node_id in path_ids]
+        nodes_index = self.nodes_index
+        names = []
+        for path_id in self.get_path(node_id):
+            # Same fallbacks as get_node_name, with one lookup per node
+            node = nodes_index.get(path_id)
+            names.append(node['props'].get('name', 'Unnamed') if node else 'Unknown')
+        return names
 
     def is_root_node(self, node_id: str) -> bool:
         """
@@ -200,11 +244,7 @@ class TanaParser:
         Returns:
             List of root node IDs
         """
-        roots = []
-        for node_id in self.nodes_index:
-            if self.is_root_node(node_id) and not self.is_system_node(node_id):
-                roots.append(node_id)
-        return roots
+        return list(self._root_nodes)
 
     def count_descendants(self, node_id: str) -> int:
         """
@@ -216,14 +256,9 @@ class TanaParser:
         Returns:
             Number of descendants
         """
-        count = 0
-        children = self.get_children(node_id)
-
-        for child_id in children:
-            count += 1
-            count += self.count_descendants(child_id)
-
-        return count
+        if node_id not in self._descendant_count:
+            self._compute_subtree(node_id)
+        return self._descendant_count[node_id]
 
     def get_tree_depth(self, node_id: str) -> int:
         """
@@ -235,16 +270,42 @@ class TanaParser:
         Returns:
             Maximum depth (0 for leaf nodes)
         """
-        children = self.get_children(node_id)
-        if not children:
-            return 0
+        if node_id not in self._subtree_depth:
+            self._compute_subtree(node_id)
+        return self._subtree_depth[node_id]
 
-        max_child_depth = 0
-        for child_id in children:
-            child_depth = self.get_tree_depth(child_id)
-            max_child_depth = max(max_child_depth, child_depth)
+    def _compute_subtree(self, node_id: str) -> None:
+        """
+        Fill the descendant count and depth caches for a subtree.
 
-        return max_child_depth + 1
+        Walks the subtree post-order with an explicit stack, so deep trees
+        don't hit the recursion limit and already computed subtrees are reused.
+        A child that closes a parent cycle is skipped.
+
+        Args:
+            node_id: ID of the subtree root
+        """
+        counts = self._descendant_count
+        depths = self._subtree_depth
+        get_children = self.get_children
+        in_progress = set()
+        stack = [(node_id, False)]
+
+        while stack:
+            current, expanded = stack.pop()
+            if expanded:
+                in_progress.discard(current)
+                count = depth = 0
+                for child_id in get_children(current):
+                    if child_id in counts:
+                        count += counts[child_id] + 1
+                        depth = max(depth, depths[child_id] + 1)
+                counts[current] = count
+                depths[current] = depth
+            elif current not in counts and current not in in_progress:
+                in_progress.add(current)
+                stack.append((current, True))
+                stack.extend((child_id, False) for child_id in get_children(current))
 
     def search_nodes(self, query: str, search_type: str = 'name') -> List[str]:
         """
@@ -257,31 +318,111 @@ class TanaParser:
         Returns:
             List of matching node IDs
         """
-        matches = []
         query_lower = query.lower()
 
-        for node_id, node in self.nodes_index.items():
-            props = node['props']
+        if search_type == 'type':
+            return self._search_types(query_lower)
+
+        search_index = self._get_search_index()
+        if search_type == 'name':
+            return [node_id for node_id, name, _, _ in search_index if query_lower in name]
+        if search_type == 'description':
+            return [node_id for node_id, _, description, _ in search_index
+                    if query_lower in description]
+        if search_type == 'all':
+            return [node_id for node_id, name, description, node_type in search_index
+                    if query_lower in name or query_lower in description
+                    or query_lower in node_type]
+        return []
 
-            if search_type in ['name', 'all']:
-                name = props.get('name', '').lower()
-                if query_lower in name:
-                    matches.append(node_id)
-                    continue
+    def search_many(self, queries: List[str], search_type: str = 'name') -> Dict[str, List[str]]:
+        """
+        Run several searches in a single pass over the nodes.
+
+        Each query matches exactly as in search_nodes. With pyahocorasick
+        installed, all queries are found in one automaton scan per field.
+
+        Args:
+            queries: Search queries
+            search_type: Type of search ('name', 'description', 'type', 'all')
 
-            if search_type in ['description', 'all']:
-                description = props.get('description', '').lower()
-                if query_lower in description:
-                    matches.append(node_id)
-                    continue
+        Returns:
+            Dictionary mapping each query to its list of matching node IDs
+        """
+        lowered = {query: query.lower() for query in queries}
+        if search_type == 'type':
+            return {query: self._search_types(query_lower) for query, query_lower in lowered.items()}
+
+        needles = set(lowered.values())
+        matches = {needle: [] for needle in needles}
+        columns = _SEARCH_COLUMNS.get(search_type)
+        if columns:
+            # The empty query matches every node and can't go into the automaton
+            match_all = matches.pop('', None)
+            needles.discard('')
+
+            automaton = None
+            if ahocorasick is not None and needles:
+                automaton = ahocorasick.Automaton()
+                for needle in needles:
+                    automaton.add_word(needle, needle)
+                automaton.make_automaton()
+
+            for row in self._get_search_index():
+                node_id = row[0]
+                if match_all is not None:
+                    match_all.append(node_id)
+                if automaton is not None:
+                    found = {needle for column in columns for _, needle in automaton.iter(row[column])}
+                else:
+                    found = {needle for needle in needles
+                             if any(needle in row[column] for column in columns)}
+                for needle in found:
+                    matches[needle].append(node_id)
+
+            if match_all is not None:
+                matches[''] = match_all
+
+        return {query: list(matches[query_lower]) for query, query_lower in lowered.items()}
+
+    def _get_search_index(self) -> List[Tuple[str, str, str, str]]:
+        """
+        Get (id, name, description, type) rows lowercased once for searching.
 
-            if search_type in ['type', 'all']:
-                node_type = props.get('_docType', '').lower()
-                if query_lower in node_type:
-                    matches.append(node_id)
-                    continue
+        Returns:
+            List of lowercased search rows in document order
+        """
+        if self._search_index is None:
+            rows = []
+            for node_id, node in self.nodes_index.items():
+                props = node['props']
+                rows.append((
+                    node_id,
+                    (props.get('name') or '').lower(),
+                    (props.get('description') or '').lower(),
+                    (props.get('_docType') or '').lower()
+                ))
+            self._search_index = rows
+        return self._search_index
 
-        return matches
+    def _search_types(self, query_lower: str) -> List[str]:
+        """
+        Find nodes whose type contains a lowercased query, using the type index.
+
+        Args:
+            query_lower: Lowercased search query
+
+        Returns:
+            List of matching node IDs in document order
+        """
+        matched = [ids for node_type, ids in self._by_type.items()
+                   if query_lower in (node_type or '').lower()]
+        if len(matched) <= 1:
+            return list(matched[0]) if matched else []
+
+        # Several types match; keep the document order of a full scan
+        wanted = set().union(*matched)
+        return [node_id for node_id in self.nodes_index if node_id in wanted]
 
     def get_nodes_by_type(self, node_type: str) -> List[str]:
         """
@@ -293,11 +434,7 @@ class TanaParser:
         Returns:
             List of node IDs matching the type
         """
-        matches = []
-        for node_id, node in self.nodes_index.items():
-            if node['props'].get('_docType') == node_type:
-                matches.append(node_id)
-        return matches
+        return list(self._by_type.get(node_type, ()))
 
     def get_statistics(self) -> Dict[str, Any]:
         """
@@ -308,7 +445,7 @@ class TanaParser:
         """
         stats = {
             'total_nodes': len(self.nodes_index),
-            'root_nodes': len(self.get_root_nodes()),
+            'root_nodes': len(self._root_nodes),
             'system_nodes': 0,
             'user_nodes': 0,
             'node_types': defaultdict(int),
@@ -317,28 +454,25 @@ class TanaParser:
             'leaf_nodes': 0
         }
 
-        # Count node types and system vs user nodes
+        # Count node types, system vs user nodes and parents vs leaves in one pass
+        children = self._children
+        node_types = stats['node_types']
+        system_nodes = nodes_with_children = 0
         for node_id, node in self.nodes_index.items():
-            if self.is_system_node(node_id):
-                stats['system_nodes'] += 1
-            else:
-                stats['user_nodes'] += 1
-
-            node_type = node['props'].get('_docType', 'unknown')
-            stats['node_types'][node_type] += 1
-
-        # Calculate tree depth and count nodes with children
-        for root_id in self.get_root_nodes()[:10]:  # Sample first 10 roots for performance
-            depth = self.get_tree_depth(root_id)
-            stats['max_depth'] = max(stats['max_depth'], depth)
-
-        # Count nodes with children vs leaf nodes
-        for node_id in self.nodes_index:
-            children = self.get_children(node_id)
-            if children:
-                stats['nodes_with_children'] += 1
-            else:
-                stats['leaf_nodes'] += 1
+            if node_id.startswith('SYS_'):  # Inlined is_system_node
+                system_nodes += 1
+            node_types[node['props'].get('_docType', 'unknown')] += 1
+            if node_id in children:
+                nodes_with_children += 1
+
+        stats['system_nodes'] = system_nodes
+        stats['user_nodes'] = stats['total_nodes'] - system_nodes
+        stats['nodes_with_children'] = nodes_with_children
+        stats['leaf_nodes'] = stats['total_nodes'] - nodes_with_children
+
+        # Subtree depths are memoized, so covering every root is one linear walk
+        get_tree_depth = self.get_tree_depth
+        stats['max_depth'] = max((get_tree_depth(root_id) for root_id in self._root_nodes), default=0)
 
         return dict(stats)
 
@@ -361,26 +495,23 @@ class TanaParser:
             errors.append("'docs' field must be a list")
             return errors
 
-        # Check each document
-        required_doc_fields = ['id']
+        # Check each document; 'id' is the only required field
+        add_error = errors.append
         for i, doc in enumerate(docs):
             if not isinstance(doc, dict):
-                errors.append(f"Document {i} is not an object")
+                add_error(f"Document {i} is not an object")
                 continue
 
-            for field in required_doc_fields:
-                if field not in doc:
-                    errors.append(f"Document {i} missing required field: {field}")
+            if 'id' not in doc:
+                add_error(f"Document {i} missing required field: id")
 
             # Validate document structure
             if 'props' in doc and not isinstance(doc['props'], dict):
-                errors.append(f"Document {i} 'props' field is not an object")
+                add_error(f"Document {i} 'props' field is not an object")
 
             # Check for circular references
-            if 'parentId' in doc:
-                parent_id = doc['parentId']
-                if parent_id == doc.get('id'):
-                    errors.append(f"Document {i} has itself as parent")
+            if 'parentId' in doc and doc['parentId'] == doc.get('id'):
+                add_error(f"Document {i} has itself as parent")
 
         return errors
 
@@ -411,19 +542,14 @@ class TanaParser:
 
         # Get recent nodes
         recent_nodes = []
-        for node_id, node in list(self.nodes_index.items())[:10]:
+        for node_id, node in islice(self.nodes_index.items(), 10):
             created = node['props'].get('created')
             if created:
                 try:
-                    # Handle different timestamp formats
-                    if isinstance(created, (int, float)):
-                        created_dt = datetime.fromtimestamp(created / 1000 if created > 1e10 else created)
-                    else:
-                        created_dt = datetime.fromisoformat(created.replace('Z', '+00:00'))
                     recent_nodes.append({
                         'id': node_id,
                         'name': self.get_node_name(node_id),
-                        'created': created_dt.isoformat()
+                        'created': _format_created(created)
                     })
                 except (ValueError, TypeError):
                     pass
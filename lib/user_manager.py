@@ -2,12 +2,15 @@
 
 import json
 import hashlib
+import hmac
 import secrets
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 
+from . import json_backend
 from .colors import Colors
+from .passwords import hash_password, needs_rehash, verify_password
 from .tana_io import TanaIO
 
 # Default paths
@@ -33,10 +36,11 @@ class UserManager:
 
     def _init_users_file(self) -> None:
         """Initialize the users metadata file"""
+        now = datetime.now().isoformat()
         initial_data = {
             "version": "1.0",
-            "created_at": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat(),
+            "created_at": now,
+            "last_updated": now,
             "users": {}
         }
         self._save_users_data(initial_data)
@@ -44,8 +48,7 @@ class UserManager:
     def _load_users_data(self) -> Dict[str, Any]:
         """Load users data from file"""
         try:
-            with open(self.users_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return json_backend.load_path(self.users_file)
         except Exception as e:
             Colors.error(f"Error loading users data: {e}")
 
@@ -53,8 +56,8 @@ class UserManager:
         """Save users data to file"""
         try:
             data["last_updated"] = datetime.now().isoformat()
-            with open(self.users_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(self.users_file, 'wb') as f:
+                f.write(json_backend.dumps(data, indent=True))
         except Exception as e:
             Colors.error(f"Error saving users data: {e}")
 
@@ -99,8 +102,7 @@ class UserManager:
         if not password:
             password = secrets.token_urlsafe(16)
 
-        # Hash password (simple for now, use bcrypt in production)
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
+        password_hash = hash_password(password)
 
         # Create user data
         user_id = secrets.token_urlsafe(8)
@@ -143,23 +145,23 @@ class UserManager:
 
     def authenticate_user(self, username: str, password: str) -> Optional[Dict[str, Any]]:
         """Authenticate user with password"""
-        user = self.get_user(username)
+        users_data = self._load_users_data()
+        user = users_data["users"].get(username)
         if not user:
             return None
 
         # Verify password
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-        if password_hash != user.get("password_hash"):
+        if not verify_password(password, user.get("password_hash")):
             return None
 
-        # Update last login
-        users_data = self._load_users_data()
-        users_data["users"][username]["last_login"] = datetime.now().isoformat()
-        self._save_users_data(users_data)
+        # Upgrade legacy hashes now that we have the plaintext
+        if needs_rehash(user.get("password_hash")):
+            user["password_hash"] = hash_password(password)
 
-        # Generate new JWT token
+        # Update last login and issue a new JWT token in a single write
+        user["last_login"] = datetime.now().isoformat()
         jwt_token = self._generate_jwt_token(username)
-        users_data["users"][username]["jwt_token"] = jwt_token
+        user["jwt_token"] = jwt_token
         self._save_users_data(users_data)
 
         # Return user info without sensitive data
@@ -180,7 +182,8 @@ class UserManager:
 
         # Simple validation - find user with matching token
         for username, user_data in users_data["users"].items():
-            if user_data.get("jwt_token") == token:
+            if hmac.compare_digest((user_data.get("jwt_token") or "").encode('utf-8'),
+                                   token.encode('utf-8')):
                 # Check if token is not expired (simple check)
                 # In production, use proper JWT validation
                 return {
@@ -5,44 +5,66 @@ Manages KeyTags files per workspace ID instead of global keytags.
 Each workspace gets its own {workspace_id}-keytags.json file.
 """
 
+import copy
 import json
+import os
 import time
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any, List, Tuple, Optional
 
+from . import json_backend
 from .colors import Colors
 
+# Places a workspace ID can live in an export, in order of preference
+_WORKSPACE_ID_PREFIXES = (
+    "metadata.workspace_id",
+    "metadata.workspaceId",
+    "workspace_id",
+    "workspaceId"
+)
+
+# Node fields that might contain workspace info
+_WORKSPACE_FIELDS = ("workspace_id", "workspaceId", "workspace", "space_id", "spaceId")
+
 
 class WorkspaceKeyTagsManager:
     """Workspace-specific KeyTags management"""
 
+    __slots__ = ('files_dir', 'metadata_dir', '_workspace_cache', '_keytags_cache')
+
     def __init__(self, files_dir: Path = None):
         """Initialize with custom files directory"""
         self.files_dir = files_dir or Path("./files")
         self.metadata_dir = self.files_dir / "metadata"
+        # Keytags file path -> ((mtime_ns, size), workspace summary)
+        self._workspace_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        # Workspace ID -> ((mtime_ns, size), parsed keytags)
+        self._keytags_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
 
     def get_workspace_id_from_json(self, json_file_path: Path) -> Optional[str]:
         """Extract workspace ID from Tana JSON export"""
         try:
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                tana_data = json.load(f)
-
-            # Look for workspace ID in metadata section
-            if isinstance(tana_data, dict):
-                # Check various possible locations for workspace ID
-                metadata = tana_data.get("metadata", {})
-                workspace_id = (
-                    metadata.get("workspace_id") or
-                    metadata.get("workspaceId") or
-                    tana_data.get("workspace_id") or
-                    tana_data.get("workspaceId") or
+            # Stream only the values that can hold the ID instead of loading the export
+            candidates = {}
+            node_workspace_id = None
+            prefixes = _WORKSPACE_ID_PREFIXES + ("nodes.item",)
+            for prefix, value in json_backend.iter_values(json_file_path, prefixes):
+                if prefix != "nodes.item":
+                    candidates[prefix] = value
+                    if prefix == _WORKSPACE_ID_PREFIXES[0] and value:
+                        break
+                elif node_workspace_id is None:
                     # Look in nodes for workspace info
-                    self._extract_workspace_id_from_nodes(tana_data.get("nodes", []))
-                )
+                    node_workspace_id = self._extract_workspace_id_from_nodes([value])
 
-                if workspace_id:
-                    return str(workspace_id)
+            workspace_id = next(
+                (candidates[prefix] for prefix in _WORKSPACE_ID_PREFIXES if candidates.get(prefix)),
+                node_workspace_id
+            )
+
+            if workspace_id:
+                return str(workspace_id)
 
             return None
 
@@ -52,26 +74,22 @@ class WorkspaceKeyTagsManager:
 
     def _extract_workspace_id_from_nodes(self, nodes: List[Dict]) -> Optional[str]:
         """Extract workspace ID from node data"""
-        for node in nodes:
-            if isinstance(node, dict):
-                # Check various fields that might contain workspace info
-                workspace_fields = [
-                    "workspace_id",
-                    "workspaceId",
-                    "workspace",
-                    "space_id",
-                    "spaceId"
-                ]
-
-                for field in workspace_fields:
-                    if field in node and node[field]:
-                        return str(node[field])
-
-                # Recursively check children
-                if "children" in node and isinstance(node["children"], list):
-                    result = self._extract_workspace_id_from_nodes(node["children"])
-                    if result:
-                        return result
+        # Depth-first in document order; the stack holds nodes reversed
+        stack = list(nodes)
+        stack.reverse()
+        while stack:
+            node = stack.pop()
+            if not isinstance(node, dict):
+                continue
+
+            for field in _WORKSPACE_FIELDS:
+                value = node.get(field)
+                if value:
+                    return str(value)
+
+            children = node.get("children")
+            if isinstance(children, list):
+                stack.extend(reversed(children))
 
         return None
 
@@ -80,17 +98,24 @@ class WorkspaceKeyTagsManager:
         return self.metadata_dir / f"{workspace_id}-keytags.json"
 
     def load_keytags(self, workspace_id: str) -> Dict[str, Any]:
-        """Load keytags file for specific workspace"""
+        """Load keytags file for specific workspace; unchanged files are copied from a shared cache"""
         keytags_file = self.get_keytags_file_path(workspace_id)
 
-        if not keytags_file.exists():
+        try:
+            stat_result = keytags_file.stat()
+        except OSError:
             Colors.info(f"KeyTags file not found for workspace '{workspace_id}': {keytags_file}")
             Colors.info("Creating starter KeyTags file...")
             return self.create_starter_keytags_file(workspace_id)
 
+        file_key = (stat_result.st_mtime_ns, stat_result.st_size)
+        cached = self._keytags_cache.get(workspace_id)
+        if cached is not None and cached[0] == file_key:
+            # Callers edit the returned dict in place, so never hand out the cached one
+            return copy.deepcopy(cached[1])
+
         try:
-            with open(keytags_file, 'r', encoding='utf-8') as f:
-                keytags_data = json.load(f)
+            keytags_data = json_backend.load_path(keytags_file)
 
             # Verify workspace ID matches
             if keytags_data.get("workspace_id") != workspace_id:
@@ -98,6 +123,8 @@ class WorkspaceKeyTagsManager:
                 # Update the workspace ID
                 keytags_data["workspace_id"] = workspace_id
                 self.save_keytags(workspace_id, keytags_data)
+            else:
+                self._keytags_cache[workspace_id] = (file_key, copy.deepcopy(keytags_data))
 
             return keytags_data
 
@@ -138,6 +165,8 @@ class WorkspaceKeyTagsManager:
     def save_keytags(self, workspace_id: str, keytags_data: Dict[str, Any],
                     import_file: str = None) -> bool:
         """Save keytags file for specific workspace"""
+        # The next load re-reads the file rather than trusting the caller's copy
+        self._keytags_cache.pop(workspace_id, None)
         try:
             # Ensure workspace ID is set
             keytags_data["workspace_id"] = workspace_id
@@ -151,10 +180,8 @@ class WorkspaceKeyTagsManager:
             # Ensure metadata directory exists
             self.metadata_dir.mkdir(parents=True, exist_ok=True)
 
-            keytags_file = self.get_keytags_file_path(workspace_id)
-
-            with open(keytags_file, 'w', encoding='utf-8') as f:
-                json.dump(keytags_data, f, indent=2, ensure_ascii=False)
+            # Write to a unique temp file and swap it in so a crash can't truncate the keytags
+            json_backend.dump_path(self.get_keytags_file_path(workspace_id), keytags_data, indent=True)
 
             return True
 
@@ -169,29 +196,44 @@ class WorkspaceKeyTagsManager:
         if not self.metadata_dir.exists():
             return workspaces
 
-        for keytags_file in self.metadata_dir.glob("*-keytags.json"):
+        with os.scandir(self.metadata_dir) as entries:
+            keytags_entries = [entry for entry in entries
+                               if entry.name.endswith("-keytags.json") and entry.is_file()]
+
+        # Only files whose mtime or size changed since the last call are re-read
+        previous_cache = self._workspace_cache
+        cache = {}
+        for entry in keytags_entries:
+            keytags_file = entry.path
             try:
-                with open(keytags_file, 'r', encoding='utf-8') as f:
-                    keytags_data = json.load(f)
-
-                workspace_id = keytags_file.stem.replace("-keytags", "")
-                workspaces.append({
-                    "workspace_id": workspace_id,
-                    "workspace_name": keytags_data.get("workspace_name", workspace_id),
-                    "file_path": str(keytags_file),
-                    "created_at": keytags_data.get("created_at"),
-                    "total_supertags": keytags_data.get("total_supertags", 0),
-                    "last_import": keytags_data.get("last_import"),
-                    "source_file": keytags_data.get("source_file")
-                })
+                stat_result = entry.stat()
+                file_key = (stat_result.st_mtime_ns, stat_result.st_size)
+                cached = previous_cache.get(keytags_file)
+                if cached is None or cached[0] != file_key:
+                    keytags_data = json_backend.load_path(keytags_file)
+
+                    workspace_id = entry.name[:-len(".json")].replace("-keytags", "")
+                    cached = (file_key, {
+                        "workspace_id": workspace_id,
+                        "workspace_name": keytags_data.get("workspace_name", workspace_id),
+                        "file_path": keytags_file,
+                        "created_at": keytags_data.get("created_at"),
+                        "total_supertags": keytags_data.get("total_supertags", 0),
+                        "last_import": keytags_data.get("last_import"),
+                        "source_file": keytags_data.get("source_file")
+                    })
+                cache[keytags_file] = cached
+                workspaces.append(dict(cached[1]))
 
             except Exception as e:
                 Colors.error(f"Error reading workspace keytags {keytags_file}: {e}")
 
+        self._workspace_cache = cache
         return workspaces
 
     def delete_workspace(self, workspace_id: str) -> bool:
         """Delete a workspace's keytags file"""
+        self._keytags_cache.pop(workspace_id, None)
         try:
             keytags_file = self.get_keytags_file_path(workspace_id)
 
@@ -217,8 +259,7 @@ class WorkspaceKeyTagsManager:
             return True
 
         try:
-            with open(global_keytags_file, 'r', encoding='utf-8') as f:
-                global_data = json.load(f)
+            global_data = json_backend.load_path(global_keytags_file)
 
             # Create a default workspace for the global data
             default_workspace_id = "default_workspace"
@@ -12,23 +12,30 @@ class Colors:
     BOLD = '\033[1m'
     END = '\033[0m'
 
+    # Message templates with the ANSI codes already filled in
+    SUCCESS_FMT = f"{GREEN}✅ %s{END}\n"
+    ERROR_FMT = f"{RED}❌ %s{END}\n"
+    INFO_FMT = f"{BLUE}ℹ️  %s{END}\n"
+    WARNING_FMT = f"{YELLOW}⚠️  %s{END}\n"
+
     @classmethod
     def success(cls, msg):
         """Print success message"""
-        print(f"{cls.GREEN}✅ {msg}{cls.END}")
+        sys.stdout.write(cls.SUCCESS_FMT % (msg,))
 
     @classmethod
     def error(cls, msg):
         """Print error message and exit"""
-        print(f"{cls.RED}❌ {msg}{cls.END}")
+        sys.stdout.write(cls.ERROR_FMT % (msg,))
+        sys.stdout.flush()
         sys.exit(1)
 
     @classmethod
     def info(cls, msg):
         """Print info message"""
-        print(f"{cls.BLUE}ℹ️  {msg}{cls.END}")
+        sys.stdout.write(cls.INFO_FMT % (msg,))
 
     @classmethod
     def warning(cls, msg):
         """Print warning message"""
-        print(f"{cls.YELLOW}⚠️  {msg}{cls.END}")
\ No newline at end of file
+        sys.stdout.write(cls.WARNING_FMT % (msg,))
\ No newline at end of file
@@ -0,0 +1,163 @@
+"""JSON backend: orjson when it is installed, stdlib json otherwise"""
+
+import json
+import os
+import secrets
+import stat
+from pathlib import Path
+from typing import Any, Collection, Iterator, List, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is an optional streaming parser
+    ijson = None
+
+HAS_ORJSON = orjson is not None
+HAS_IJSON = ijson is not None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception whichever backend is active
+JSONDecodeError = json.JSONDecodeError
+
+# orjson reads integers outside 64 bits as floats, so documents with a digit run
+# this long (even one inside a string) are parsed by the stdlib instead
+_LONG_DIGIT_RUN = b'0' * 19
+# Maps digits to '0' and every other byte to a space
+_DIGITS_ONLY = bytes(0x30 if 0x30 <= c <= 0x39 else 0x20 for c in range(256))
+
+
+def _has_long_digit_run(data: Union[bytes, str]) -> bool:
+    """Whether data may hold an integer that orjson can't represent exactly"""
+    if isinstance(data, str):
+        data = data.encode('utf-8', 'surrogatepass')
+    return _LONG_DIGIT_RUN in data.translate(_DIGITS_ONLY)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document from bytes or str"""
+    if orjson is not None and not _has_long_digit_run(data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # NaN, Infinity and out-of-range floats are valid for the stdlib parser
+    return json.loads(data)
+
+
+def load_path(file_path: Union[Path, str]) -> Any:
+    """Read and parse a JSON file in one go"""
+    with open(file_path, 'rb') as f:
+        return loads(f.read())
+
+
+def dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, optionally indented by two spaces"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option)
+        except orjson.JSONEncodeError:
+            pass  # Integers beyond 64 bits; the stdlib also raises for anything truly unserializable
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def dump_path(file_path: Union[Path, str], data: Any, indent: bool = False) -> None:
+    """Write a JSON file atomically, keeping the permissions of the file it replaces"""
+    file_path = Path(file_path)
+    payload = dumps(data, indent=indent)
+    try:
+        mode = stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        mode = None
+
+    # A unique sibling temp file, so concurrent saves never share one and an
+    # interrupted save never leaves the target truncated. It is created the way
+    # open() creates files, so a new target gets the usual umask-derived mode
+    tmp_path = file_path.parent / f".{file_path.name}.{secrets.token_hex(8)}.tmp"
+    fd = os.open(tmp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        with open(fd, 'wb') as f:
+            f.write(payload)
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def iter_top_level_keys(file_path: Union[Path, str]) -> Iterator[str]:
+    """Yield the keys of a top-level JSON object, streaming when ijson is available"""
+    if ijson is None:
+        data = load_path(file_path)
+        if isinstance(data, dict):
+            yield from data
+        return
+
+    with open(file_path, 'rb') as f:
+        try:
+            events = ijson.parse(f)
+            if next(events, (None, None, None))[1] != 'start_map':
+                return
+            for prefix, event, value in events:
+                if prefix == '' and event == 'map_key':
+                    yield value
+        except ijson.JSONError as e:
+            raise JSONDecodeError(str(e), '', 0) from e
+
+
+def _resolve_prefix(value: Any, parts: List[str]) -> Iterator[Any]:
+    """Yield the values an ijson-style prefix points to inside loaded data"""
+    if not parts:
+        yield value
+        return
+    head, rest = parts[0], parts[1:]
+    if head == 'item':
+        if isinstance(value, list):
+            for item in value:
+                yield from _resolve_prefix(item, rest)
+    elif isinstance(value, dict) and head in value:
+        yield from _resolve_prefix(value[head], rest)
+
+
+def iter_values(file_path: Union[Path, str], prefixes: Collection[str]) -> Iterator[Tuple[str, Any]]:
+    """Yield (prefix, value) for values at ijson-style prefixes, streaming when ijson is available"""
+    if ijson is None:
+        data = load_path(file_path)
+        for prefix in prefixes:
+            for value in _resolve_prefix(data, prefix.split('.')):
+                yield prefix, value
+        return
+
+    with open(file_path, 'rb') as f:
+        builder = None
+        try:
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    # Only the matched values are built, one at a time
+                    builder.event(event, value)
+                    if event in ('start_map', 'start_array'):
+                        depth += 1
+                    elif event in ('end_map', 'end_array'):
+                        depth -= 1
+                        if not depth:
+                            yield built_prefix, builder.value
+                            builder = None
+                elif prefix in prefixes:
+                    if event in ('start_map', 'start_array'):
+                        builder = ijson.ObjectBuilder()
+                        builder.event(event, value)
+                        built_prefix, depth = prefix, 1
+                    elif event != 'map_key':
+                        yield prefix, value
+        except ijson.JSONError as e:
+            raise JSONDecodeError(str(e), '', 0) from e
@@ -0,0 +1,50 @@
+"""Password hashing with scrypt; legacy unsalted SHA-256 hashes still verify"""
+
+import hashlib
+import hmac
+import secrets
+
+# scrypt cost: 16 MiB of memory and tens of milliseconds per hash
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+_SALT_BYTES = 16
+_KEY_BYTES = 32
+_PREFIX = "scrypt$"
+
+
+def _scrypt(password: str, salt: bytes, n: int, r: int, p: int) -> bytes:
+    """Derive the scrypt key for a password"""
+    return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                          maxmem=256 * n * r, dklen=_KEY_BYTES)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password as scrypt$n$r$p$salt$key with a random salt"""
+    salt = secrets.token_bytes(_SALT_BYTES)
+    key = _scrypt(password, salt, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return f"{_PREFIX}{SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${key.hex()}"
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    """Check a password against an scrypt hash or a legacy SHA-256 hex digest"""
+    if not stored_hash:
+        return False
+
+    if stored_hash.startswith(_PREFIX):
+        try:
+            _, n, r, p, salt, key = stored_hash.split("$")
+            expected = bytes.fromhex(key)
+            derived = _scrypt(password, bytes.fromhex(salt), int(n), int(r), int(p))
+        except ValueError:
+            return False
+        return hmac.compare_digest(derived, expected)
+
+    # Hashes written before scrypt was introduced
+    digest = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(digest.encode(), stored_hash.encode('utf-8'))
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """Whether a stored hash is legacy or uses older scrypt parameters"""
+    return not (stored_hash or "").startswith(f"{_PREFIX}{SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$")
@@ -1,15 +1,96 @@
 """S3-backed user manager for persistent user storage in DigitalOcean Spaces"""
 
-import json
 import boto3
-from datetime import datetime
-from typing import Dict, Optional, List
-import hashlib
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, List, Tuple
+import hmac
+import logging
 import secrets
+import threading
 import uuid
 
 from src.config import settings
 
+from . import json_backend
+from .passwords import hash_password, needs_rehash, verify_password
+
+# One client per process so urllib3 keeps its TCP/TLS connections warm
+_s3_client = None
+_s3_client_lock = threading.Lock()
+
+
+def get_s3_client():
+    """Get the shared S3 client, creating it on first use"""
+    global _s3_client
+    if _s3_client is None:
+        with _s3_client_lock:
+            if _s3_client is None:
+                _s3_client = boto3.client(
+                    's3',
+                    endpoint_url=settings.s3_endpoint,
+                    aws_access_key_id=settings.s3_access_key,
+                    aws_secret_access_key=settings.s3_secret_key,
+                    region_name=settings.s3_region,
+                    config=Config(
+                        max_pool_connections=50,
+                        retries={'max_attempts': 3, 'mode': 'standard'},
+                        tcp_keepalive=True
+                    )
+                )
+    return _s3_client
+
+
+# S3 GETs are I/O bound and read throughput per process flattens past ~16
+_FETCH_WORKERS = 16
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool for parallel S3 reads, creating it on first use"""
+    global _executor
+    if _executor is None:
+        with _s3_client_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=_FETCH_WORKERS,
+                                               thread_name_prefix='s3-users')
+    return _executor
+
+
+# (ETag, body) of the user objects seen by this process, keyed by username;
+# later reads send the ETag so S3 can answer 304 instead of resending the user
+_user_cache: Dict[str, Tuple[str, bytes]] = {}
+
+# Conditional writes are turned off if the endpoint rejects them; writes then
+# compare against a HEAD of the object first, which narrows but can't close the race
+_conditional_writes = True
+
+_SAVE_ATTEMPTS = 5
+
+# True until this process has seen metadata/users.json migrated or absent; lookups
+# that miss retry the migration meanwhile, in case the startup attempt failed
+_legacy_pending = True
+_legacy_lock = threading.Lock()
+
+# DeleteObjects accepts at most this many keys per request
+_DELETE_BATCH = 1000
+
+
+def _iso_now_z() -> str:
+    """Current UTC time as an ISO 8601 string ending in Z"""
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+def _error_code(error: ClientError) -> str:
+    """Get the S3 error code from a botocore ClientError"""
+    return error.response.get('Error', {}).get('Code', '')
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a user object changed on S3 between our read and write"""
+
 
 class S3UserManager:
     """S3-backed user manager that stores users in DigitalOcean Spaces"""
@@ -29,15 +110,14 @@ class S3UserManager:
             raise ValueError("S3_REGION environment variable is required")
 
         try:
-            self.s3_client = boto3.client(
-                's3',
-                endpoint_url=settings.s3_endpoint,
-                aws_access_key_id=settings.s3_access_key,
-                aws_secret_access_key=settings.s3_secret_key,
-                region_name=settings.s3_region
-            )
+            self.s3_client = get_s3_client()
             self.bucket = settings.s3_bucket
-            self.users_key = "metadata/users.json"
+            # One object per user, so lookups and writes don't scale with the user count
+            self.users_prefix = "users/"
+            self.legacy_users_key = "metadata/users.json"
+            self.legacy_backup_key = "metadata/users.json.migrated"
+            # metadata/tokens/{token} holds the username, so a token is checked in two GETs
+            self.tokens_prefix = "metadata/tokens/"
 
             # Skip HeadBucket test to avoid CORS/permission issues
             # We'll test actual access during operations instead
@@ -45,63 +125,232 @@ class S3UserManager:
         except Exception as e:
             raise ValueError(f"Failed to initialize S3 client: {str(e)}")
 
-    def _load_users(self) -> Dict:
-        """Load users from S3"""
+    @staticmethod
+    def invalidate():
+        """Drop cached user objects so the next reads download them again"""
+        _user_cache.clear()
+
+    def _user_key(self, username: str) -> str:
+        """Get the S3 key of a user's object"""
+        return f"{self.users_prefix}{username}.json"
+
+    def _token_key(self, token: str) -> str:
+        """Get the S3 key of an API token's pointer object"""
+        return f"{self.tokens_prefix}{token}"
+
+    def _put_token(self, token: str, username: str):
+        """Point an API token at its user"""
+        self.s3_client.put_object(
+            Bucket=self.bucket,
+            Key=self._token_key(token),
+            Body=username.encode('utf-8'),
+            ContentType='text/plain'
+        )
+
+    def _delete_token(self, token: Optional[str]):
+        """Remove an API token's pointer object if there is one"""
+        if token:
+            self.s3_client.delete_object(Bucket=self.bucket, Key=self._token_key(token))
+
+    def migrate_legacy_users(self) -> int:
+        """Split a legacy metadata/users.json into per-user objects; returns users migrated"""
+        global _legacy_pending
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket, Key=self.users_key)
-            content = response['Body'].read().decode('utf-8')
-            data = json.loads(content)
-            return data.get("users", {})
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self.legacy_users_key)
         except self.s3_client.exceptions.NoSuchKey:
-            # Users file doesn't exist, return empty dict
-            return {}
+            _legacy_pending = False
+            return 0
         except Exception as e:
-            raise Exception(f"Failed to load users from S3: {str(e)}")
+            raise Exception(f"Failed to migrate users.json in S3: {str(e)}")
 
-    def _save_users(self, users: Dict):
-        """Save users to S3"""
         try:
-            data = {
-                "version": "1.0",
-                "created_at": datetime.utcnow().isoformat() + "Z",
-                "updated_at": datetime.utcnow().isoformat() + "Z",
-                "users": users
-            }
-
-            content = json.dumps(data, indent=2)
-            self.s3_client.put_object(
+            users = json_backend.loads(response['Body'].read()).get("users", {})
+            migrated = 0
+            for username, user in users.items():
+                if self.seed_user(username, user, overwrite=False):
+                    migrated += 1
+
+            # Keep a copy, then remove the original so deleted users don't come back
+            self.s3_client.copy_object(
                 Bucket=self.bucket,
-                Key=self.users_key,
-                Body=content.encode('utf-8'),
-                ContentType='application/json',
-                CacheControl='no-cache, no-store, must-revalidate'
+                Key=self.legacy_backup_key,
+                CopySource={'Bucket': self.bucket, 'Key': self.legacy_users_key}
             )
+            self.s3_client.delete_object(Bucket=self.bucket, Key=self.legacy_users_key)
+        except Exception as e:
+            raise Exception(f"Failed to migrate users.json in S3: {str(e)}")
+        _legacy_pending = False
+        return migrated
+
+    def _migrate_if_pending(self) -> bool:
+        """Retry an unfinished legacy migration after a miss; returns True if a lookup should be retried"""
+        if not _legacy_pending:
+            return False
+        with _legacy_lock:
+            if not _legacy_pending:
+                # Another thread finished it while we waited
+                return True
+            try:
+                return self.migrate_legacy_users() > 0
+            except Exception as e:
+                logging.warning(f"Legacy users.json migration skipped: {str(e)}")
+                return False
+
+    def seed_user(self, username: str, user: Dict, overwrite: bool = True) -> bool:
+        """Write a complete user record and its token pointer; returns False if kept existing"""
+        try:
+            if overwrite:
+                existing, etag = self._load_user(username)
+                self._put_user(username, user, etag)
+                if existing and existing.get("api_token") != user.get("api_token"):
+                    self._delete_token(existing.get("api_token"))
+            else:
+                # Never overwrite a user that already has its own object
+                self._put_user(username, user, None)
+        except ConcurrentUpdateError:
+            if overwrite:
+                raise Exception(f"Failed to save user to S3: '{username}' changed during seeding")
+            return False
+        if user.get("api_token"):
+            self._put_token(user["api_token"], username)
+        return True
+
+    def _load_user(self, username: str) -> Tuple[Optional[Dict], Optional[str]]:
+        """Load one user and its ETag, reusing the cached copy when the ETag still matches"""
+        cached = _user_cache.get(username)
+        try:
+            try:
+                if cached is None:
+                    response = self.s3_client.get_object(Bucket=self.bucket, Key=self._user_key(username))
+                else:
+                    response = self.s3_client.get_object(
+                        Bucket=self.bucket, Key=self._user_key(username), IfNoneMatch=cached[0]
+                    )
+                etag, body = response['ETag'], response['Body'].read()
+                _user_cache[username] = (etag, body)
+            except ClientError as e:
+                if cached is None or _error_code(e) not in ('304', 'NotModified'):
+                    raise
+                etag, body = cached
+
+            # Parse a fresh dict every time; callers mutate what they get back
+            return json_backend.loads(body), etag
+        except self.s3_client.exceptions.NoSuchKey:
+            _user_cache.pop(username, None)
+            if self._migrate_if_pending():
+                return self._load_user(username)
+            return None, None
+        except Exception as e:
+            raise Exception(f"Failed to load user from S3: {str(e)}")
+
+    def _put_user(self, username: str, user: Dict, etag: Optional[str]):
+        """Write one user, refusing to overwrite a version we haven't read"""
+        global _conditional_writes
+        body = json_backend.dumps(user, indent=True)
+        put_args = {
+            'Bucket': self.bucket,
+            'Key': self._user_key(username),
+            'Body': body,
+            'ContentType': 'application/json',
+            'CacheControl': 'no-cache, no-store, must-revalidate'
+        }
+        # etag None means the user must not exist yet
+        condition = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+
+        if _conditional_writes:
+            try:
+                response = self.s3_client.put_object(**put_args, **condition)
+                _user_cache[username] = (response['ETag'], body)
+                return
+            except ClientError as e:
+                code = _error_code(e)
+                if code in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                    _user_cache.pop(username, None)
+                    raise ConcurrentUpdateError(f"User '{username}' was changed by another writer")
+                if code != 'NotImplemented':
+                    raise
+                logging.warning(f"S3 endpoint {settings.s3_endpoint} rejected a conditional write; "
+                                "falling back to checking user objects before writing them")
+                _conditional_writes = False
+
+        if self._head_etag(username) != etag:
+            _user_cache.pop(username, None)
+            raise ConcurrentUpdateError(f"User '{username}' was changed by another writer")
+        response = self.s3_client.put_object(**put_args)
+        _user_cache[username] = (response['ETag'], body)
+
+    def _head_etag(self, username: str) -> Optional[str]:
+        """Get the current ETag of a user's object, or None if it doesn't exist"""
+        try:
+            return self.s3_client.head_object(Bucket=self.bucket, Key=self._user_key(username))['ETag']
+        except ClientError as e:
+            if _error_code(e) in ('404', 'NoSuchKey', 'NotFound'):
+                return None
+            raise
+
+    def _save_user(self, username: str, user: Dict, etag: Optional[str]):
+        """Save one user to S3"""
+        try:
+            self._put_user(username, user, etag)
+        except ConcurrentUpdateError:
+            raise
+        except Exception as e:
+            raise Exception(f"Failed to save user to S3: {str(e)}")
+
+    def _modify_user(self, username: str, modify: Callable[[Dict], Tuple[bool, Any]],
+                     missing: Any = None) -> Any:
+        """Load, modify and save one user, re-running modify if another writer got in first"""
+        # modify returns (changed, result); nothing is written when changed is False
+        for attempt in range(_SAVE_ATTEMPTS):
+            user, etag = self._load_user(username)
+            if user is None:
+                return missing
+            changed, result = modify(user)
+            if not changed:
+                return result
+            try:
+                self._save_user(username, user, etag)
+                return result
+            except ConcurrentUpdateError:
+                if attempt == _SAVE_ATTEMPTS - 1:
+                    raise Exception("Failed to save user to S3: too many concurrent updates")
+
+    def _list_usernames(self) -> List[str]:
+        """List usernames from the keys under the users prefix"""
+        usernames = []
+        try:
+            paginator = self.s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=self.users_prefix):
+                for obj in page.get('Contents', []):
+                    key = obj['Key']
+                    if key.endswith('.json'):
+                        usernames.append(key[len(self.users_prefix):-len('.json')])
         except Exception as e:
-            raise Exception(f"Failed to save users to S3: {str(e)}")
+            raise Exception(f"Failed to list users in S3: {str(e)}")
+        return usernames
+
+    def count_users(self) -> int:
+        """Count the user objects without downloading them"""
+        return len(self._list_usernames())
 
     def _hash_password(self, password: str) -> str:
-        """Hash password using SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hash password with salted scrypt"""
+        return hash_password(password)
 
     def list_users(self) -> List[Dict]:
         """List all users"""
-        users = self._load_users()
-        return list(users.values())
+        # Fetch the user objects in parallel over the shared client
+        loaded = _get_executor().map(self._load_user, self._list_usernames())
+        return [user for user, _ in loaded if user is not None]
 
     def get_user(self, username: str) -> Optional[Dict]:
         """Get user by username"""
-        users = self._load_users()
-        return users.get(username)
+        user, _ = self._load_user(username)
+        return user
 
     def create_user(self, name: str, username: str, password: str, email: str,
                    tana_api_key: str = None, node_id: str = None) -> Dict:
         """Create a new user"""
-        users = self._load_users()
-
-        # Check if user already exists
-        if username in users:
-            raise ValueError(f"User '{username}' already exists")
-
         # Create user object
         user = {
             "id": f"user_{secrets.token_hex(8)}",
@@ -109,7 +358,7 @@ class S3UserManager:
             "username": username,
             "email": email,
             "password_hash": self._hash_password(password),
-            "created_at": datetime.utcnow().isoformat() + "Z",
+            "created_at": _iso_now_z(),
             "last_login": None,
             "is_active": True,
             "preferences": {
@@ -124,80 +373,165 @@ class S3UserManager:
         if node_id:
             user["node_id"] = node_id
 
-        # Save user
-        users[username] = user
-        self._save_users(users)
+        # Check if user already exists; the conditional put also catches a racing create
+        existing, _ = self._load_user(username)
+        if existing is not None:
+            raise ValueError(f"User '{username}' already exists")
+        try:
+            self._save_user(username, user, None)
+        except ConcurrentUpdateError:
+            raise ValueError(f"User '{username}' already exists")
 
         return user
 
     def update_user(self, username: str, updates: Dict) -> bool:
         """Update user information"""
-        users = self._load_users()
+        def apply_updates(user: Dict) -> Tuple[bool, bool]:
+            # Update fields
+            for field, value in updates.items():
+                if field == "password":
+                    # Hash password if updating
+                    user["password_hash"] = self._hash_password(value)
+                elif field in ["name", "email", "tana_api_key", "node_id", "is_active"]:
+                    user[field] = value
 
-        if username not in users:
-            return False
+            user["updated_at"] = _iso_now_z()
+            return True, True
 
-        user = users[username]
-
-        # Update fields
-        for field, value in updates.items():
-            if field == "password":
-                # Hash password if updating
-                user["password_hash"] = self._hash_password(value)
-            elif field in ["name", "email", "tana_api_key", "node_id", "is_active"]:
-                user[field] = value
-
-        user["updated_at"] = datetime.utcnow().isoformat() + "Z"
-
-        # Save updated users
-        users[username] = user
-        self._save_users(users)
-
-        return True
+        return self._modify_user(username, apply_updates, missing=False)
 
     def delete_user(self, username: str) -> bool:
         """Delete a user"""
-        users = self._load_users()
-
-        if username not in users:
+        user, _ = self._load_user(username)
+        if user is None:
             return False
 
-        del users[username]
-        self._save_users(users)
-
+        try:
+            self.s3_client.delete_object(Bucket=self.bucket, Key=self._user_key(username))
+            self._delete_token(user.get("api_token"))
+        except Exception as e:
+            raise Exception(f"Failed to delete user from S3: {str(e)}")
+        _user_cache.pop(username, None)
         return True
 
+    def create_users_bulk(self, users_list: List[Dict]) -> List[Dict]:
+        """Create several users in parallel; each entry holds create_user's arguments"""
+        futures = [_get_executor().submit(self.create_user, **fields) for fields in users_list]
+        # Let every create finish before surfacing the first failure
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+        return [future.result() for future in futures]
+
+    def delete_users_bulk(self, usernames: List[str]) -> List[str]:
+        """Delete several users with batched DeleteObjects calls; returns those that existed"""
+        loaded = list(_get_executor().map(self._load_user, usernames))
+
+        deleted = []
+        keys = []
+        for username, (user, _) in zip(usernames, loaded):
+            if user is None:
+                continue
+            deleted.append(username)
+            keys.append(self._user_key(username))
+            if user.get("api_token"):
+                keys.append(self._token_key(user["api_token"]))
+
+        try:
+            for start in range(0, len(keys), _DELETE_BATCH):
+                response = self.s3_client.delete_objects(
+                    Bucket=self.bucket,
+                    Delete={
+                        'Objects': [{'Key': key} for key in keys[start:start + _DELETE_BATCH]],
+                        'Quiet': True
+                    }
+                )
+                if response.get('Errors'):
+                    error = response['Errors'][0]
+                    raise Exception(f"{error.get('Key')}: {error.get('Message')}")
+        except Exception as e:
+            raise Exception(f"Failed to delete users from S3: {str(e)}")
+        finally:
+            for username in deleted:
+                _user_cache.pop(username, None)
+
+        return deleted
+
     def verify_password(self, username: str, password: str) -> bool:
         """Verify user password"""
         user = self.get_user(username)
         if not user:
             return False
 
-        password_hash = self._hash_password(password)
-        return user.get("password_hash") == password_hash
+        stored_hash = user.get("password_hash")
+        if not verify_password(password, stored_hash):
+            return False
+
+        # Upgrade legacy hashes now that we have the plaintext
+        if needs_rehash(stored_hash):
+            def rehash(current: Dict) -> Tuple[bool, None]:
+                if current.get("password_hash") != stored_hash:
+                    return False, None
+                current["password_hash"] = self._hash_password(password)
+                return True, None
+
+            try:
+                self._modify_user(username, rehash)
+            except Exception:
+                pass  # Best effort; the old hash keeps working until the next login
+
+        return True
 
     def generate_api_token(self, username: str) -> str:
         """Generate API token for user"""
         token = str(uuid.uuid4())
-        users = self._load_users()
+        replaced = []
 
-        if username in users:
-            users[username]["api_token"] = token
-            users[username]["token_created_at"] = datetime.utcnow().isoformat() + "Z"
-            self._save_users(users)
+        def set_token(user: Dict) -> Tuple[bool, bool]:
+            replaced[:] = [user.get("api_token")]
+            user["api_token"] = token
+            user["token_created_at"] = _iso_now_z()
+            return True, True
+
+        try:
+            # Write the pointer first so a token is never handed out unverifiable
+            self._put_token(token, username)
+            if not self._modify_user(username, set_token, missing=False):
+                self._delete_token(token)
+                return token
+            self._delete_token(replaced[0])
+        except Exception as e:
+            raise Exception(f"Failed to save API token to S3: {str(e)}")
 
         return token
 
+    def _token_username(self, token: str) -> Optional[str]:
+        """Get the username an API token points at, or None if there's no pointer"""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket, Key=self._token_key(token))
+            return response['Body'].read().decode('utf-8')
+        except self.s3_client.exceptions.NoSuchKey:
+            return None
+        except Exception as e:
+            raise Exception(f"Failed to look up API token in S3: {str(e)}")
+
     def verify_api_token(self, token: str) -> Optional[Dict]:
         """Verify API token and return user data"""
-        users = self._load_users()
-
-        for username, user_data in users.items():
-            if user_data.get("api_token") == token:
-                return user_data
+        username = self._token_username(token)
+        if username is None and self._migrate_if_pending():
+            username = self._token_username(token)
+        if username is None:
+            return None
+
+        # The user's own record decides; a stale pointer doesn't grant access
+        user_data = self.get_user(username)
+        if user_data and hmac.compare_digest((user_data.get("api_token") or "").encode('utf-8'),
+                                             token.encode('utf-8')):
+            return user_data
 
         return None
 
     def get_user_by_token(self, token: str) -> Optional[Dict]:
         """Get user by API token"""
-        return self.verify_api_token(token)
\ No newline at end of file
+        return self.verify_api_token(token)
@@ -1,11 +1,19 @@
 """Health check endpoints for MCP server."""
 
+import asyncio
 import json
 import time
 from typing import Dict, Any
 from fastapi import FastAPI
 from fastapi.responses import JSONResponse
 
+# Probes arrive every few seconds; reuse the last result for this long
+_CHECK_TTL = 5.0
+_LAST_CHECK: Dict[str, Any] = {"ts": 0.0, "checks": None}
+
+# Kept open between probes so the Tana API connection is reused
+_http_client = None
+
 
 def setup_health_endpoints(app: FastAPI) -> None:
     """Set up health check endpoints."""
@@ -50,26 +58,42 @@ def setup_health_endpoints(app: FastAPI) -> None:
             }
         )
 
+    @app.on_event("shutdown")
+    async def close_http_client() -> None:
+        """Close the shared Tana API client."""
+        global _http_client
+        if _http_client is not None:
+            await _http_client.aclose()
+            _http_client = None
+
+
+def _get_http_client():
+    """Get the shared async HTTP client, creating it on first use."""
+    global _http_client
+    if _http_client is None:
+        import httpx
+
+        _http_client = httpx.AsyncClient(timeout=5.0)
+    return _http_client
+
 
 async def perform_readiness_checks() -> Dict[str, Any]:
     """Perform readiness checks on external dependencies."""
+    now = time.monotonic()
+    if _LAST_CHECK["checks"] is not None and now - _LAST_CHECK["ts"] < _CHECK_TTL:
+        return _LAST_CHECK["checks"]
+
     checks = {}
 
     # Check S3 connectivity
     try:
-        import boto3
+        from lib.s3_user_manager import get_s3_client
         from src.config import settings
 
-        s3_client = boto3.client(
-            's3',
-            endpoint_url=settings.s3_endpoint,
-            aws_access_key_id=settings.s3_access_key,
-            aws_secret_access_key=settings.s3_secret_key,
-            region_name=settings.s3_region
-        )
+        s3_client = get_s3_client()
 
-        # Test bucket access
-        s3_client.head_bucket(Bucket=settings.s3_bucket)
+        # Test bucket access without blocking the event loop
+        await asyncio.to_thread(s3_client.head_bucket, Bucket=settings.s3_bucket)
         checks["s3"] = {"healthy": True, "message": "S3 connection successful"}
     except Exception as e:
         checks["s3"] = {"healthy": False, "message": f"S3 connection failed: {str(e)}"}
@@ -79,25 +103,24 @@ async def perform_readiness_checks() -> Dict[str, Any]:
         from src.config import settings
 
         if settings.tana_api_key:
-            import httpx
-
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://europe-west1.tagr-consolidated-prod.cloudfunctions.net/api/v1",
-                    headers={"Authorization": f"Bearer {settings.tana_api_key}"},
-                    timeout=5.0
-                )
-
-                if response.status_code == 200:
-                    checks["tana_api"] = {"healthy": True, "message": "Tana API accessible"}
-                else:
-                    checks["tana_api"] = {
-                        "healthy": False,
-                        "message": f"Tana API returned status {response.status_code}"
-                    }
+            response = await _get_http_client().get(
+                "https://europe-west1.tagr-consolidated-prod.cloudfunctions.net/api/v1",
+                headers={"Authorization": f"Bearer {settings.tana_api_key}"},
+                timeout=5.0
+            )
+
+            if response.status_code == 200:
+                checks["tana_api"] = {"healthy": True, "message": "Tana API accessible"}
+            else:
+                checks["tana_api"] = {
+                    "healthy": False,
+                    "message": f"Tana API returned status {response.status_code}"
+                }
         else:
             checks["tana_api"] = {"healthy": True, "message": "Tana API key not configured"}
     except Exception as e:
         checks["tana_api"] = {"healthy": False, "message": f"Tana API check failed: {str(e)}"}
 
+    _LAST_CHECK["ts"] = time.monotonic()
+    _LAST_CHECK["checks"] = checks
     return checks
\ No newline at end of file
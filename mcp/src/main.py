@@ -65,6 +65,24 @@ except ImportError:
 # Security
 security = HTTPBearer()
 
+# Test account seeded into Spaces by the setup endpoints
+TEST_USER = {
+    "id": "oBJXXTOlwLA",
+    "name": "Test User",
+    "username": "testuser",
+    "email": "test@example.com",
+    "tana_api_key": "dummykey",
+    "password_hash": "7e6e0c3079a08c5cc6036789b57e951f65f82383913ba1a49ae992544f1b4b6e",
+    "created_at": "2025-12-05T22:52:26.833824",
+    "last_login": None,
+    "is_active": True,
+    "preferences": {
+        "default_export_dir": "files/exports",
+        "auto_backup": True,
+        "theme": "auto"
+    }
+}
+
 # Authentication functions
 def verify_auth_token(request: Request) -> dict:
     """Verify authentication token from request and return user data."""
@@ -102,8 +120,8 @@ async def get_mcp_user(request: Request):
             )
 
         token = auth_header[7:]  # Remove "Bearer " prefix
-        user_manager = S3UserManager()
-        user = user_manager.verify_api_token(token)
+        # S3 calls block, so keep them off the event loop
+        user = await asyncio.to_thread(lambda: S3UserManager().verify_api_token(token))
         if not user:
             raise HTTPException(
                 status_code=401,
@@ -219,6 +237,17 @@ Authorization: Bearer your_api_token_here
     }
 )
 
+@app.on_event("startup")
+async def migrate_legacy_users():
+    """Move users from a legacy metadata/users.json into per-user objects."""
+    try:
+        migrated = await asyncio.to_thread(lambda: S3UserManager().migrate_legacy_users())
+        if migrated:
+            logging.info(f"Migrated {migrated} user(s) from metadata/users.json")
+    except Exception as e:
+        # Users keep working from their own objects; retry on the next start
+        logging.warning(f"Legacy users.json migration skipped: {str(e)}")
+
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
@@ -354,59 +383,11 @@ async def custom_swagger_ui_html():
 async def list_tools():
     """List available tools via REST API."""
 
-    # Try to upload users.json to Spaces when this endpoint is called
-    try:
-        import boto3
-        import json
-
-        if settings.s3_access_key and settings.s3_secret_key:
-            # Initialize S3 client
-            s3_client = boto3.client(
-                's3',
-                endpoint_url=settings.s3_endpoint,
-                aws_access_key_id=settings.s3_access_key,
-                aws_secret_access_key=settings.s3_secret_key,
-                region_name=settings.s3_region
-            )
-
-            # Create users.json content
-            users_data = json.dumps({
-                "version": "1.0",
-                "created_at": "2025-12-06T05:23:00.000Z",
-                "users": {
-                    "testuser": {
-                        "id": "oBJXXTOlwLA",
-                        "name": "Test User",
-                        "username": "testuser",
-                        "email": "test@example.com",
-                        "tana_api_key": "dummykey",
-                        "password_hash": "7e6e0c3079a08c5cc6036789b57e951f65f82383913ba1a49ae992544f1b4b6e",
-                        "created_at": "2025-12-05T22:52:26.833824",
-                        "last_login": None,
-                        "is_active": True,
-                        "preferences": {
-                            "default_export_dir": "files/exports",
-                            "auto_backup": True,
-                            "theme": "auto"
-                        }
-                    }
-                }
-            }, indent=2)
-
-            # Upload users.json to Spaces
-            s3_client.put_object(
-                Bucket=settings.s3_bucket,
-                Key="metadata/users.json",
-                Body=users_data.encode('utf-8'),
-                ContentType='application/json'
-            )
-
-            spaces_status = "users.json uploaded successfully"
-        else:
-            spaces_status = "S3 credentials not configured"
-
-    except Exception as e:
-        spaces_status = f"Spaces upload failed: {str(e)} | Type: {type(e).__name__}"
+    # Listing tools never writes; POST /api/v1/spaces/setup-essential seeds the test user
+    if settings.s3_access_key and settings.s3_secret_key:
+        spaces_status = "S3 credentials configured"
+    else:
+        spaces_status = "S3 credentials not configured"
 
     return {
         "tools": [
@@ -588,12 +569,10 @@ async def validate_outline_content(content: str = Body(..., embed=True)):
 
 # Spaces essential setup endpoints - inline implementation
 @app.post("/api/v1/spaces/setup-essential", tags=["API"])
-async def setup_essential_spaces():
+def setup_essential_spaces():
     """Setup essential files in DigitalOcean Spaces for login system."""
     try:
         import boto3
-        import os
-        import json
 
         # Use the configured settings
         if not settings.s3_access_key or not settings.s3_secret_key:
@@ -611,46 +590,18 @@ async def setup_essential_spaces():
         # Test bucket access
         s3_client.head_bucket(Bucket=settings.s3_bucket)
 
-        # Create users.json content
-        users_data = json.dumps({
-            "version": "1.0",
-            "created_at": "2025-12-06T05:20:00.000Z",
-            "users": {
-                "testuser": {
-                    "id": "oBJXXTOlwLA",
-                    "name": "Test User",
-                    "username": "testuser",
-                    "email": "test@example.com",
-                    "tana_api_key": "dummykey",
-                    "password_hash": "7e6e0c3079a08c5cc6036789b57e951f65f82383913ba1a49ae992544f1b4b6e",
-                    "created_at": "2025-12-05T22:52:26.833824",
-                    "last_login": None,
-                    "is_active": True,
-                    "preferences": {
-                        "default_export_dir": "files/exports",
-                        "auto_backup": True,
-                        "theme": "auto"
-                    }
-                }
-            }
-        }, indent=2)
-
-        # Upload users.json to Spaces
-        s3_client.put_object(
-            Bucket=settings.s3_bucket,
-            Key="metadata/users.json",
-            Body=users_data.encode('utf-8'),
-            ContentType='application/json',
-            CacheControl='no-cache'
-        )
+        # Store the test user as its own object
+        user_manager = S3UserManager()
+        user_manager.seed_user(TEST_USER["username"], dict(TEST_USER))
+        key = f"{user_manager.users_prefix}{TEST_USER['username']}.json"
 
         return {
             "message": "Essential Spaces setup completed",
             "details": {
                 "success": True,
                 "bucket": settings.s3_bucket,
-                "key": "metadata/users.json",
-                "url": f"https://{settings.s3_bucket}.{settings.s3_region}.digitaloceanspaces.com/metadata/users.json"
+                "key": key,
+                "url": f"https://{settings.s3_bucket}.{settings.s3_region}.digitaloceanspaces.com/{key}"
             }
         }
 
@@ -659,11 +610,10 @@ async def setup_essential_spaces():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/v1/spaces/test", tags=["API"])
-async def test_spaces_connection():
-    """Test DigitalOcean Spaces connection and users.json availability."""
+def test_spaces_connection():
+    """Test DigitalOcean Spaces connection and user availability."""
     try:
         import boto3
-        import json
 
         if not settings.s3_access_key or not settings.s3_secret_key:
             raise Exception("S3 credentials not configured")
@@ -679,33 +629,30 @@ async def test_spaces_connection():
         # Test bucket access
         s3_client.head_bucket(Bucket=settings.s3_bucket)
 
-        # Test if users.json exists
-        try:
-            response = s3_client.get_object(Bucket=settings.s3_bucket, Key="metadata/users.json")
-            users_content = response['Body'].read().decode('utf-8')
-            users_data = json.loads(users_content)
-
+        # Test if any user objects exist
+        users_count = S3UserManager().count_users()
+        if users_count:
             return {
                 "message": "Spaces connection successful",
                 "details": {
                     "success": True,
                     "bucket": settings.s3_bucket,
-                    "users_json_exists": True,
-                    "users_count": len(users_data.get("users", {})),
+                    "users_exist": True,
+                    "users_count": users_count,
                     "endpoint": settings.s3_endpoint
                 }
             }
 
-        except Exception:
-            return {
-                "message": "Spaces connection successful but users.json missing",
-                "details": {
-                    "success": True,
-                    "bucket": settings.s3_bucket,
-                    "users_json_exists": False,
-                    "endpoint": settings.s3_endpoint
-                }
+        return {
+            "message": "Spaces connection successful but no users found",
+            "details": {
+                "success": True,
+                "bucket": settings.s3_bucket,
+                "users_exist": False,
+                "users_count": 0,
+                "endpoint": settings.s3_endpoint
             }
+        }
 
     except Exception as e:
         from fastapi import HTTPException
@@ -756,7 +703,7 @@ async def test_endpoint():
 
 # User Management endpoints
 @app.get("/api/users", tags=["Users"])
-async def list_users(request: Request):
+def list_users(request: Request):
     """List all users (requires authentication)."""
     # Manual authentication check
     require_auth(request)
@@ -773,7 +720,7 @@ async def list_users(request: Request):
         raise HTTPException(status_code=500, detail=f"Failed to list users: {str(e)}")
 
 @app.get("/api/users/{username}", tags=["Users"], dependencies=[Depends(get_current_user)])
-async def get_user(username: str):
+def get_user(username: str):
     """Get specific user by username (requires authentication)."""
     try:
         user_manager = S3UserManager()
@@ -789,7 +736,7 @@ async def get_user(username: str):
         raise HTTPException(status_code=500, detail=f"Failed to get user: {str(e)}")
 
 @app.post("/api/users", tags=["Users"])
-async def create_user(request: Request, user_data: CreateUserRequest):
+def create_user(request: Request, user_data: CreateUserRequest):
     """Create a new user."""
     # Manual authentication check
     require_auth(request)
@@ -829,7 +776,7 @@ async def create_user(request: Request, user_data: CreateUserRequest):
         raise HTTPException(status_code=500, detail=f"Failed to create user: {str(e)}")
 
 @app.post("/api/users/{username}/generate-token", tags=["Users"], dependencies=[Depends(get_current_user)])
-async def generate_api_token(username: str):
+def generate_api_token(username: str):
     """Generate API token for user."""
     try:
         user_manager = S3UserManager()
@@ -855,7 +802,7 @@ async def generate_api_token(username: str):
         raise HTTPException(status_code=500, detail=f"Failed to generate API token: {str(e)}")
 
 @app.put("/api/users/{username}", tags=["Users"])
-async def update_user(username: str, updates: UpdateUserRequest):
+def update_user(username: str, updates: UpdateUserRequest):
     """Update user information."""
     try:
         user_manager = S3UserManager()
@@ -900,7 +847,7 @@ async def update_user(username: str, updates: UpdateUserRequest):
         raise HTTPException(status_code=500, detail=f"Failed to update user: {str(e)}")
 
 @app.delete("/api/users/{username}", tags=["Users"])
-async def delete_user(username: str):
+def delete_user(username: str):
     """Delete a user."""
     try:
         user_manager = S3UserManager()
@@ -929,7 +876,7 @@ async def delete_user(username: str):
 
 # Spaces management endpoints
 @app.post("/api/spaces/setup", tags=["Spaces"])
-async def setup_spaces(request: Request):
+def setup_spaces(request: Request):
     """Setup directory structure in DigitalOcean Spaces."""
     # Manual authentication check
     require_auth(request)
@@ -947,7 +894,7 @@ async def setup_spaces(request: Request):
         raise HTTPException(status_code=500, detail=result["error"])
 
 @app.get("/api/spaces/list", tags=["Spaces"])
-async def list_spaces(request: Request):
+def list_spaces(request: Request):
     """List directories in DigitalOcean Spaces."""
     # Manual authentication check
     require_auth(request)
@@ -1465,24 +1412,10 @@ async def handle_mcp(request: MCPRequest, http_request: Request):
             if tool_name == "check_auth_status":
                 # Check if Tana API key is configured and test Spaces access
                 try:
-                    import boto3
-                    import json
-
                     if settings.s3_access_key and settings.s3_secret_key:
-                        s3_client = boto3.client(
-                            's3',
-                            endpoint_url=settings.s3_endpoint,
-                            aws_access_key_id=settings.s3_access_key,
-                            aws_secret_access_key=settings.s3_secret_key,
-                            region_name=settings.s3_region
-                        )
-
-                        # Test if users.json exists
+                        # Count the per-user objects
                         try:
-                            response = s3_client.get_object(Bucket=settings.s3_bucket, Key="metadata/users.json")
-                            users_content = response['Body'].read().decode('utf-8')
-                            users_data = json.loads(users_content)
-                            users_count = len(users_data.get("users", {}))
+                            users_count = await asyncio.to_thread(lambda: S3UserManager().count_users())
 
                             result = {
                                 "content": [
@@ -1497,7 +1430,7 @@ async def handle_mcp(request: MCPRequest, http_request: Request):
                                 "content": [
                                     {
                                         "type": "text",
-                                        "text": f"⚠️  Spaces access configured but users.json not found: {str(spaces_error)}"
+                                        "text": f"⚠️  Spaces access configured but users could not be listed: {str(spaces_error)}"
                                     }
                                 ]
                             }
@@ -245,6 +245,75 @@ class CLITester:
             "has_usage": "usage:" in result["stdout"].lower() if result["success"] else False
         }
 
+    def test_search_files_keywords(self):
+        """Test keyword counting in TanaIO.search_files"""
+        script = (
+            "import sys, tempfile\n"
+            "from pathlib import Path\n"
+            "sys.path.insert(0, '.')\n"
+            "from lib import tana_io\n"
+            "tana_io.SEARCH_CHUNK_SIZE = 4\n"
+            "files_dir = Path(tempfile.mkdtemp())\n"
+            "(files_dir / 'a.json').write_text('{\"name\": \"AAAA aa Caf\u00e9 caf\u00e9\"}', encoding='utf-8')\n"
+            "io = tana_io.TanaIO(files_dir)\n"
+            "search = lambda keyword: [info.matches for info in io.search_files(keyword, [files_dir])]\n"
+            "print(search(''), search('aa'), search('café'), search('missing'))\n"
+            "other_dir = Path(tempfile.mkdtemp())\n"
+            "(other_dir / 'b.json').write_text('{\"name\": \"\u0130zmir \u212aelvin\"}', encoding='utf-8')\n"
+            "(other_dir / 'c.json').write_bytes(b'{\"name\": \"kiwi \\xff\"}')\n"
+            "print([info.matches for info in io.search_files('i', [other_dir])],\n"
+            "      [info.matches for info in io.search_files('k', [other_dir])])\n"
+        )
+        result = self.run_command(["python", "-c", script])
+        if not result["success"]:
+            raise Exception(result["stderr"].strip())
+
+        output = result["stdout"].strip()
+        # An empty keyword matches nothing; counts don't overlap or split across chunks.
+        # Matching follows str.lower() ('\u0130' holds an 'i') and files that aren't UTF-8 are skipped
+        if output != "[] [3] [2] []\n[3] [1]":
+            raise Exception(f"Unexpected match counts: {output}")
+
+        return {"match_counts": output}
+
+    def test_password_hashing(self):
+        """Test scrypt password hashing and the upgrade of legacy SHA-256 hashes"""
+        script = (
+            "import sys, hashlib, tempfile\n"
+            "from pathlib import Path\n"
+            "sys.path.insert(0, '.')\n"
+            "from lib import passwords\n"
+            "from lib.user_manager import UserManager\n"
+            "stored = passwords.hash_password('s3cret')\n"
+            "checks = [passwords.verify_password('s3cret', stored), passwords.verify_password('wrong', stored),\n"
+            "          passwords.needs_rehash(stored)]\n"
+            "checks += [passwords.verify_password('s3cret', 'scrypt$16384$8$1$zz$00'),\n"
+            "           passwords.verify_password('s3cret', 'scrypt$broken')]\n"
+            "users = UserManager(Path(tempfile.mkdtemp()))\n"
+            "users.create_user('Ann', 'ann', 'ann@example.com', 'key', 's3cret')\n"
+            "data = users._load_users_data()\n"
+            "data['users']['ann']['password_hash'] = hashlib.sha256(b's3cret').hexdigest()\n"
+            "users._save_users_data(data)\n"
+            "checks += [users.authenticate_user('ann', 'wrong') is None,\n"
+            "           users.authenticate_user('ann', 's3cret') is not None,\n"
+            "           passwords.needs_rehash(users.get_user('ann')['password_hash']),\n"
+            "           users.authenticate_user('ann', 's3cret') is not None]\n"
+            "passwords.SCRYPT_N = 2 ** 15\n"
+            "checks += [passwords.needs_rehash(stored), passwords.verify_password('s3cret', stored)]\n"
+            "print(checks)\n"
+        )
+        result = self.run_command(["python", "-c", script])
+        if not result["success"]:
+            raise Exception(result["stderr"].strip())
+
+        output = result["stdout"].strip().splitlines()[-1]
+        # Legacy hashes are upgraded on login; a cost change flags old hashes but still verifies them
+        expected = "[True, False, False, False, False, True, True, False, True, True, True]"
+        if output != expected:
+            raise Exception(f"Unexpected password checks: {output}")
+
+        return {"password_checks": output}
+
     def test_environment_setup(self):
         """Test if environment is properly set up for CLI"""
         # Check if we can import the main module
@@ -270,6 +339,8 @@ class CLITester:
         self.test("Login Tool", self.test_tanachat_login)
         self.test("Import JSON Tool", self.test_tanachat_importjson)
         self.test("Find Tool", self.test_tanachat_find)
+        self.test("Search Files Keywords", self.test_search_files_keywords)
+        self.test("Password Hashing", self.test_password_hashing)
         self.test("Keytags Tool", self.test_tanachat_keytags)
         self.test("Obsidian Tool", self.test_tanachat_obsidian)
 
@@ -7,11 +7,69 @@ Tests the MCP protocol server running locally.
 
 import requests
 import json
+import os
+import subprocess
 import sys
 import time
 import uuid
+from pathlib import Path
 from typing import Dict, Any, List
 
+# Exercises S3UserManager's token pointers against an in-memory stand-in for the S3 client
+TOKEN_POINTER_SCRIPT = """
+import io, sys
+from botocore.exceptions import ClientError
+sys.path.insert(0, '.')
+from lib import s3_user_manager
+
+class FakeS3:
+    class exceptions:
+        class NoSuchKey(ClientError):
+            def __init__(self):
+                super().__init__({'Error': {'Code': 'NoSuchKey'}}, 'GetObject')
+
+    def __init__(self):
+        self.objects = {}
+        self.version = 0
+
+    def get_object(self, Bucket, Key, **kwargs):
+        if Key not in self.objects:
+            raise self.exceptions.NoSuchKey()
+        etag, body = self.objects[Key]
+        return {'ETag': etag, 'Body': io.BytesIO(body)}
+
+    def head_object(self, Bucket, Key):
+        return self.get_object(Bucket, Key)
+
+    def put_object(self, Bucket, Key, Body, IfMatch=None, IfNoneMatch=None, **kwargs):
+        current = self.objects.get(Key, (None,))[0]
+        if (IfNoneMatch and current) or (IfMatch and IfMatch != current):
+            raise ClientError({'Error': {'Code': 'PreconditionFailed'}}, 'PutObject')
+        self.version += 1
+        self.objects[Key] = (f'etag-{self.version}', Body if isinstance(Body, bytes) else Body.encode())
+        return {'ETag': f'etag-{self.version}'}
+
+    def delete_object(self, Bucket, Key):
+        self.objects.pop(Key, None)
+
+s3 = s3_user_manager._s3_client = FakeS3()
+users = s3_user_manager.S3UserManager()
+pointers = lambda: sorted(key for key in s3.objects if key.startswith(users.tokens_prefix))
+users.create_user('Ann', 'ann', 'pw', 'ann@example.com')
+
+first = users.generate_api_token('ann')
+second = users.generate_api_token('ann')
+checks = [pointers() == [users.tokens_prefix + second], users.verify_api_token(first) is None,
+          users.verify_api_token(second)['username']]
+users._put_token('stale', 'ann')
+checks.append(users.verify_api_token('stale') is None)
+users.generate_api_token('ghost')
+checks.append(pointers() == sorted([users.tokens_prefix + second, users.tokens_prefix + 'stale']))
+users.delete_user('ann')
+checks.append(pointers() == [users.tokens_prefix + 'stale'])
+print(checks)
+"""
+
 class MCPTester:
     def __init__(self):
         self.base_url = "http://localhost:8000"
@@ -222,6 +280,29 @@ class MCPTester:
             "success_rate": successful / len(results)
         }
 
+    def test_api_token_pointers(self):
+        """Test that API token pointer objects follow token changes and user deletion"""
+        env = dict(os.environ, S3_ACCESS_KEY="test", S3_SECRET_KEY="test", S3_BUCKET="test",
+                   S3_REGION="test", S3_ENDPOINT="http://localhost")
+        result = subprocess.run(
+            [sys.executable, "-c", TOKEN_POINTER_SCRIPT],
+            text=True,
+            capture_output=True,
+            timeout=30,
+            cwd=Path(__file__).parent.parent.parent.parent / "mcp",
+            env=env
+        )
+        if result.returncode != 0:
+            raise Exception(result.stderr.strip())
+
+        output = result.stdout.strip().splitlines()[-1]
+        # Regenerating drops the old pointer, a pointer alone grants nothing, and a missing
+        # user's token or a deleted user leaves no pointer behind
+        if output != "[True, True, 'ann', True, True, True]":
+            raise Exception(f"Unexpected token pointer checks: {output}")
+
+        return {"token_pointer_checks": output}
+
     def run_all_tests(self):
         """Run all MCP tests"""
         print("🚀 Starting Local MCP Server Tests")
@@ -235,6 +316,7 @@ class MCPTester:
         self.test("Call Validate Tana File Tool", self.test_call_validate_tana_file_tool)
         self.test("Error Handling", self.test_mcp_error_handling)
         self.test("Concurrent Requests", self.test_concurrent_requests)
+        self.test("API Token Pointers", self.test_api_token_pointers)
 
         self.print_summary()
 